@@ -1,5 +1,5 @@
 from comfy_api.latest import ComfyExtension, io
-from .nodes import LoadRawImage, LoadRawImageAdvanced
+from .nodes import LoadRawImage, LoadRawImageAdvanced, NODE_DISPLAY_NAME_MAPPINGS
 
 # V1 Legacy Mappings - Keeping for backward compatibility if needed,
 # but V3 should take precedence.
@@ -13,7 +13,7 @@ WEB_DIRECTORY = "./web"
 # V3 Entrypoint
 class RAWExtension(ComfyExtension):
     async def get_node_list(self) -> list[type[io.ComfyNode]]:
-        return [LoadRawImage, LoadRawImageAdvanced]
+        return list(NODE_CLASS_MAPPINGS.values())
 
 
 async def comfy_entrypoint() -> ComfyExtension:
@@ -22,6 +22,7 @@ async def comfy_entrypoint() -> ComfyExtension:
 
 __all__ = [
     "NODE_CLASS_MAPPINGS",
+    "NODE_DISPLAY_NAME_MAPPINGS",
     "WEB_DIRECTORY",
     "comfy_entrypoint",
 ]
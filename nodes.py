@@ -1,10 +1,21 @@
+import asyncio
 import folder_paths
+import functools
 import hashlib
-import numpy as np
 
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from comfy_api.latest import io, ui
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # Optional: without watchdog the file list falls back to stat + TTL polling
+    Observer = None
+
 try:
     from .raw_processing import (
         process_raw,
@@ -24,13 +35,263 @@ except ImportError:
     )
 
 
+# Extensions offered in the image Combo; everything else in the input dir is skipped
+RAW_EXTENSIONS = frozenset(
+    {
+        ".cr2",
+        ".cr3",
+        ".nef",
+        ".nrw",
+        ".arw",
+        ".srf",
+        ".sr2",
+        ".dng",
+        ".raf",
+        ".orf",
+        ".rw2",
+        ".pef",
+        ".iiq",
+        ".3fr",
+        ".mrw",
+        ".raw",
+        ".mos",
+        ".kdc",
+    }
+)
+
+# Seconds a directory listing is reused before the input tree is walked again.
+# The mtime check alone is not enough: it only changes for direct children.
+_FILES_CACHE_TTL = 2.0
+_FILES_CACHE = {"mtime": None, "files": None, "ts": 0}
+
+# With watchdog, filesystem events mark the listing dirty and no stat is needed
+_FILES_WATCH = {"dir": None, "observer": None, "dirty": True}
+
+# node class -> (file list the schema was built with, schema)
+_SCHEMA_CACHE = {}
+
+# LibRaw releases the GIL while decoding, so RAW nodes that ComfyUI runs
+# concurrently can develop in parallel. Threads rather than processes: the
+# tensors would otherwise be pickled back, and rawpy's OpenMP build is not
+# fork-safe. Bounded so parallel nodes don't oversubscribe LibRaw's own threads.
+_DECODE_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="rawpy"
+)
+# Thumbnail threads mostly wait on ExifTool, so they get their own pool and
+# never queue behind a develop.
+_THUMB_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rawpy-thumb")
+
+# path -> (mtime_ns, size, sha256 hex digest) of the last hashed version
+_DIGEST_CACHE = {}
+
+_thumbnail_module = None
+
+
+def _is_raw_file(name):
+    # rpartition is cheaper than os.path.splitext for this hot check
+    _, sep, ext = name.rpartition(".")
+    return bool(sep) and "." + ext.lower() in RAW_EXTENSIONS
+
+
+def _walk(root, prefix_len):
+    """Yield paths of RAW files under root, relative to the first prefix_len chars."""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue  # Unreadable, or removed since its parent was listed
+        with it:
+            for entry in it:
+                # DirEntry caches the d_type from readdir, so no extra stat() here
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and _is_raw_file(entry.name):
+                    yield entry.path[prefix_len:]
+
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def _natural_key(path):
+    """Case-insensitive sort key that orders IMG_2 before IMG_10."""
+    parts = _DIGITS.split(path.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
 def _get_files():
     input_dir = folder_paths.get_input_directory()
-    files = []
-    for root, dirs, filenames in os.walk(input_dir):
-        for filename in filenames:
-            files.append(os.path.relpath(os.path.join(root, filename), input_dir))
-    return sorted(files)
+    files = list(_walk(input_dir, len(os.path.join(input_dir, ""))))
+    files.sort(key=_natural_key)
+    return files
+
+
+if Observer is not None:
+
+    class _InputDirHandler(FileSystemEventHandler):
+        """Flags the listing for a rescan when entries appear, vanish or move."""
+
+        def _mark_dirty(self, event):
+            _FILES_WATCH["dirty"] = True
+
+        on_created = on_deleted = on_moved = _mark_dirty
+
+
+def _watch_input_dir(input_dir):
+    """Ensure a watchdog observer covers input_dir; False if one can't be used."""
+    if Observer is None:
+        return False
+    if _FILES_WATCH["dir"] == input_dir:
+        return _FILES_WATCH["observer"] is not None
+
+    if _FILES_WATCH["observer"] is not None:
+        _FILES_WATCH["observer"].stop()
+    observer = Observer()
+    try:
+        observer.schedule(_InputDirHandler(), input_dir, recursive=True)
+        observer.start()
+    except OSError:
+        # e.g. inotify watch limit reached; remember and keep polling
+        observer = None
+    _FILES_WATCH.update(dir=input_dir, observer=observer, dirty=True)
+    return observer is not None
+
+
+def _get_files_cached():
+    """Return the RAW file list, reusing the last scan while the input dir is unchanged."""
+    input_dir = folder_paths.get_input_directory()
+    if _watch_input_dir(input_dir):
+        if _FILES_WATCH["dirty"] or _FILES_CACHE["files"] is None:
+            # Clear first so events arriving mid-scan trigger another one
+            _FILES_WATCH["dirty"] = False
+            _FILES_CACHE.update(mtime=None, files=_get_files())
+        return _FILES_CACHE["files"]
+
+    try:
+        mtime = os.stat(input_dir).st_mtime_ns
+    except OSError:
+        return []  # No input directory (yet): nothing to offer
+    if (
+        _FILES_CACHE["files"] is not None
+        and _FILES_CACHE["mtime"] == mtime
+        and time.monotonic() - _FILES_CACHE["ts"] < _FILES_CACHE_TTL
+    ):
+        return _FILES_CACHE["files"]
+
+    files = _get_files()
+    _FILES_CACHE.update(mtime=mtime, files=files, ts=time.monotonic())
+    return files
+
+
+def _get_schema_cached(node_cls):
+    """Return node_cls's schema, rebuilding it only when the file list changed."""
+    files = _get_files_cached()
+    cached = _SCHEMA_CACHE.get(node_cls)
+    if cached is None or cached[0] != files:
+        cached = (files, node_cls._build_schema(files))
+        _SCHEMA_CACHE[node_cls] = cached
+    return cached[1]
+
+
+def _file_digest(image_path):
+    """Return the sha256 of a file, re-hashing only when its mtime or size changed."""
+    st = os.stat(image_path)
+    cached = _DIGEST_CACHE.get(image_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    with open(image_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        else:
+            # Python < 3.11: stream in fixed-size chunks instead of one big read
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+            digest = h.hexdigest()
+    _DIGEST_CACHE[image_path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+async def _run_in_pool(pool, func, *args, **kwargs):
+    """Run a blocking call on pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+
+@functools.lru_cache(maxsize=None)
+def _empty_thumbnail():
+    """1x1 black placeholder, shared since node outputs are treated as read-only."""
+    import torch
+
+    return torch.zeros((1, 1, 1, 3))
+
+
+def _get_thumbnail_module():
+    """Import thumbnail_extraction (torch, PIL) on first use instead of at load."""
+    global _thumbnail_module
+    if _thumbnail_module is None:
+        try:
+            from . import thumbnail_extraction as module
+        except ImportError:
+            # Fallback for unit testing where nodes is imported as top-level
+            import thumbnail_extraction as module
+        _thumbnail_module = module
+    return _thumbnail_module
+
+
+# A 24MP result is ~350 MB of float32, so only the last few are kept
+@functools.lru_cache(maxsize=4)
+def _develop_cached(image_path, mtime_ns, size, process_items):
+    """Memoized process_raw, keyed on the file version and settings."""
+    return process_raw(image_path, **dict(process_items))
+
+
+@functools.lru_cache(maxsize=32)
+def _thumbnail_cached(image_path, mtime_ns, size):
+    """Memoized embedded ThumbnailImage; raises LookupError if none was found."""
+    thumbs = _get_thumbnail_module()
+    # Read IFD1 directly; ExifTool only for the containers that doesn't cover
+    thumb_bytes = thumbs.extract_thumbnail_native(image_path, "ThumbnailImage")
+    if thumb_bytes is None and thumbs.is_exiftool_available():
+        thumb_bytes = thumbs.extract_thumbnail_exiftool(image_path, "ThumbnailImage")
+    if not thumb_bytes:
+        raise LookupError(f"No embedded thumbnail in {image_path}")
+    return thumbs.bytes_to_tensor(thumb_bytes)
+
+
+def _load_thumbnail(image_path, mtime_ns, size):
+    """Embedded ThumbnailImage, or the shared 1x1 placeholder."""
+    try:
+        return _thumbnail_cached(image_path, mtime_ns, size)
+    except LookupError:
+        # Outside the cache, so a transient ExifTool failure is retried next run
+        return _empty_thumbnail()
+
+
+async def _run_pipeline(image, **process_kwargs) -> io.NodeOutput:
+    """Shared execute() body: develop and fetch the thumbnail side by side."""
+    image_path = folder_paths.get_annotated_filepath(image)
+    try:
+        st = os.stat(image_path)
+        # The ExifTool round trip hides behind LibRaw's postprocess
+        (image_tensor, preview_tensor), thumbnail_tensor = await asyncio.gather(
+            _run_in_pool(
+                _DECODE_POOL,
+                _develop_cached,
+                image_path,
+                st.st_mtime_ns,
+                st.st_size,
+                tuple(sorted(process_kwargs.items())),
+            ),
+            _run_in_pool(
+                _THUMB_POOL, _load_thumbnail, image_path, st.st_mtime_ns, st.st_size
+            ),
+        )
+        return io.NodeOutput(image_tensor, preview_tensor, thumbnail_tensor)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load RAW image: {str(e)}")
 
 
 class LoadRawImage(io.ComfyNode):
@@ -38,13 +299,17 @@ class LoadRawImage(io.ComfyNode):
 
     @classmethod
     def define_schema(cls):
+        return _get_schema_cached(cls)
+
+    @classmethod
+    def _build_schema(cls, files):
         return io.Schema(
             node_id="Load Raw Image",
             display_name="Load RAW Image (Simple) 📷",
             category="image/raw",
             description="Load a RAW image with essential settings. Outputs the developed image, full-res preview (from rawpy), and small thumbnail (via ExifTool).",
             inputs=[
-                io.Combo.Input("image", _get_files(), upload=io.UploadType.image),
+                io.Combo.Input("image", files, upload=io.UploadType.image),
                 io.Boolean.Input(
                     "output_16bit",
                     default=True,
@@ -76,7 +341,12 @@ class LoadRawImage(io.ComfyNode):
         )
 
     @classmethod
-    def execute(
+    def fingerprint_inputs(cls, image, **kwargs):
+        # Re-run when the file's contents change, not just its name
+        return _file_digest(folder_paths.get_annotated_filepath(image))
+
+    @classmethod
+    async def execute(
         cls,
         image,
         output_16bit=True,
@@ -84,46 +354,13 @@ class LoadRawImage(io.ComfyNode):
         highlight_mode="clip",
         half_size=False,
     ) -> io.NodeOutput:
-        image_path = folder_paths.get_annotated_filepath(image)
-        try:
-            # Main RAW processing (image + preview from rawpy)
-            image_tensor, preview_tensor = process_raw(
-                image_path,
-                output_16bit=output_16bit,
-                white_balance=white_balance,
-                highlight_mode_key=highlight_mode,
-                half_size=half_size,
-            )
-
-            # Try to extract small thumbnail via ExifTool
-            try:
-                from .thumbnail_extraction import (
-                    extract_thumbnail_exiftool,
-                    bytes_to_tensor,
-                    is_exiftool_available,
-                )
-            except ImportError:
-                from thumbnail_extraction import (
-                    extract_thumbnail_exiftool,
-                    bytes_to_tensor,
-                    is_exiftool_available,
-                )
-
-            thumbnail_tensor = None
-            if is_exiftool_available():
-                thumb_bytes = extract_thumbnail_exiftool(image_path, "ThumbnailImage")
-                if thumb_bytes:
-                    thumbnail_tensor = bytes_to_tensor(thumb_bytes)
-
-            # Fallback: if ExifTool failed, use 1x1 black placeholder
-            if thumbnail_tensor is None:
-                import torch
-
-                thumbnail_tensor = torch.zeros((1, 1, 1, 3))
-
-            return io.NodeOutput(image_tensor, preview_tensor, thumbnail_tensor)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load RAW image: {str(e)}")
+        return await _run_pipeline(
+            image,
+            output_16bit=output_16bit,
+            white_balance=white_balance,
+            highlight_mode_key=highlight_mode,
+            half_size=half_size,
+        )
 
 
 class LoadRawImageAdvanced(io.ComfyNode):
@@ -131,6 +368,10 @@ class LoadRawImageAdvanced(io.ComfyNode):
 
     @classmethod
     def define_schema(cls):
+        return _get_schema_cached(cls)
+
+    @classmethod
+    def _build_schema(cls, files):
         return io.Schema(
             node_id="Load Raw Image Advanced",
             display_name="Load RAW Image (Advanced) 📷",
@@ -141,7 +382,7 @@ class LoadRawImageAdvanced(io.ComfyNode):
                 # Core
                 io.Combo.Input(
                     "image",
-                    _get_files(),
+                    files,
                     upload=io.UploadType.image,
                     tooltip="Select a raw file from your input directory (supports subfolders).",
                 ),
@@ -314,7 +555,12 @@ class LoadRawImageAdvanced(io.ComfyNode):
         )
 
     @classmethod
-    def execute(
+    def fingerprint_inputs(cls, image, **kwargs):
+        # Re-run when the file's contents change, not just its name
+        return _file_digest(folder_paths.get_annotated_filepath(image))
+
+    @classmethod
+    async def execute(
         cls,
         image,
         output_16bit=True,
@@ -340,58 +586,26 @@ class LoadRawImageAdvanced(io.ComfyNode):
         median_filter_passes=0,
         half_size=False,
     ) -> io.NodeOutput:
-        image_path = folder_paths.get_annotated_filepath(image)
-        try:
-            image_tensor, preview_tensor = process_raw(
-                image_path,
-                output_16bit=output_16bit,
-                white_balance=white_balance,
-                custom_wb=(custom_wb_r, custom_wb_g1, custom_wb_b, custom_wb_g2),
-                demosaic_key=demosaic_algorithm,
-                orientation_key=orientation,
-                use_auto_bright=use_auto_bright,
-                bright_adjustment=bright_adjustment,
-                highlight_mode_key=highlight_mode,
-                colorspace_key=output_colorspace,
-                gamma=(gamma_power, gamma_slope),
-                exp_shift=exp_shift,
-                exp_preserve_highlights=exp_preserve_highlights,
-                chromatic_aberration=(ca_red_scale, ca_blue_scale),
-                noise_thr=noise_thr if noise_thr > 0 else None,
-                fbdd_noise_reduction=fbdd_noise_reduction,
-                median_filter_passes=median_filter_passes,
-                half_size=half_size,
-            )
-
-            # Try to extract small thumbnail via ExifTool
-            try:
-                from .thumbnail_extraction import (
-                    extract_thumbnail_exiftool,
-                    bytes_to_tensor,
-                    is_exiftool_available,
-                )
-            except ImportError:
-                from thumbnail_extraction import (
-                    extract_thumbnail_exiftool,
-                    bytes_to_tensor,
-                    is_exiftool_available,
-                )
-
-            thumbnail_tensor = None
-            if is_exiftool_available():
-                thumb_bytes = extract_thumbnail_exiftool(image_path, "ThumbnailImage")
-                if thumb_bytes:
-                    thumbnail_tensor = bytes_to_tensor(thumb_bytes)
-
-            # Fallback: if ExifTool failed, use 1x1 black placeholder
-            if thumbnail_tensor is None:
-                import torch
-
-                thumbnail_tensor = torch.zeros((1, 1, 1, 3))
-
-            return io.NodeOutput(image_tensor, preview_tensor, thumbnail_tensor)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load RAW image: {str(e)}")
+        return await _run_pipeline(
+            image,
+            output_16bit=output_16bit,
+            white_balance=white_balance,
+            custom_wb=(custom_wb_r, custom_wb_g1, custom_wb_b, custom_wb_g2),
+            demosaic_key=demosaic_algorithm,
+            orientation_key=orientation,
+            use_auto_bright=use_auto_bright,
+            bright_adjustment=bright_adjustment,
+            highlight_mode_key=highlight_mode,
+            colorspace_key=output_colorspace,
+            gamma=(gamma_power, gamma_slope),
+            exp_shift=exp_shift,
+            exp_preserve_highlights=exp_preserve_highlights,
+            chromatic_aberration=(ca_red_scale, ca_blue_scale),
+            noise_thr=noise_thr if noise_thr > 0 else None,
+            fbdd_noise_reduction=fbdd_noise_reduction,
+            median_filter_passes=median_filter_passes,
+            half_size=half_size,
+        )
 
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -6,9 +6,11 @@ This script handles the working directory setup to avoid relative import issues
 with ComfyUI custom nodes. It also auto-starts ComfyUI for integration tests.
 
 Usage:
-    python run_tests.py              # Run all tests
-    python run_tests.py -m unit      # Run only unit tests (fast, no server)
+    python run_tests.py              # Run only unit tests (fast, no server)
+    python run_tests.py --all        # Run all tests (auto-starts server, in
+                                     # parallel if pytest-xdist is installed)
     python run_tests.py -m integration  # Run integration tests (auto-starts server)
+    python run_tests.py --all --runslow  # Also boot ComfyUI via main.py --quick-test-for-ci
 """
 
 import os
@@ -29,12 +31,13 @@ PYTHON_EXE = os.path.join(COMFYUI_ROOT, "venv", "Scripts", "python.exe")
 _server_process = None
 
 
-def is_server_running(host="127.0.0.1", port=8188):
+def is_server_running(host="127.0.0.1", port=8188, timeout=0.2):
     """Check if ComfyUI server is already running."""
     import socket
 
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
+        # Loopback connects either succeed or are refused almost instantly
+        s.settimeout(timeout)
         try:
             s.connect((host, port))
             return True
@@ -66,14 +69,16 @@ def start_comfyui_server():
     # Register cleanup
     atexit.register(stop_comfyui_server)
 
-    # Wait for server to be ready (max 60 seconds)
+    # Wait for server to be ready (max 60 seconds), polling every 100 ms
     print("   Waiting for server to be ready...", end="", flush=True)
-    for i in range(60):
+    start = time.monotonic()
+    for i in range(1, 601):
         if is_server_running():
-            print(f" ready! ({i + 1}s)")
+            print(f" ready! ({time.monotonic() - start:.1f}s)")
             return _server_process
-        time.sleep(1)
-        print(".", end="", flush=True)
+        time.sleep(0.1)
+        if i % 10 == 0:
+            print(".", end="", flush=True)
 
     print("\n✗ Server failed to start within 60 seconds")
     stop_comfyui_server()
@@ -93,9 +98,29 @@ def stop_comfyui_server():
         _server_process = None
 
 
+def has_xdist():
+    """Check that the interpreter running pytest has pytest-xdist installed."""
+    try:
+        probe = subprocess.run(
+            [PYTHON_EXE, "-c", "import xdist"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return False
+    return probe.returncode == 0
+
+
 def main():
     # Parse arguments to check if integration tests are requested
     args = sys.argv[1:]
+    run_all = "--all" in args
+    if run_all:
+        args.remove("--all")
+    elif "-m" not in args:
+        # Unit tests by default: don't start or boot ComfyUI unless asked to
+        args = ["-m", "unit"] + args
+
     running_integration = "-m" not in args or "integration" in args
     running_unit_only = "-m" in args and "unit" in args and "integration" not in args
 
@@ -109,6 +134,17 @@ def main():
     # Build pytest command
     pytest_args = [PYTHON_EXE, "-m", "pytest", "."] + args
 
+    # Spread slow runs over all cores when pytest-xdist is installed, keeping
+    # server-launching tests together on one worker. The unit run stays
+    # serial: it takes seconds, less than each worker re-importing torch.
+    if (
+        running_integration
+        and not running_unit_only
+        and "-n" not in args
+        and has_xdist()
+    ):
+        pytest_args += ["-n", "auto", "--dist", "loadgroup"]
+
     print(f"\n📋 Running: {' '.join(pytest_args)}")
     print(f"   Working directory: {os.getcwd()}\n")
 
@@ -6,10 +6,11 @@ Integration tests use LAZY IMPORTS to ensure unit tests can run
 even without all dependencies installed.
 """
 
+import asyncio
 import pytest
 import sys
 import os
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -51,6 +52,31 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: Integration tests (requires ComfyUI server)"
     )
+    config.addinivalue_line(
+        "markers", "serial: Launches ComfyUI itself (one xdist worker at a time)"
+    )
+    config.addinivalue_line(
+        "markers", "slow: Boots ComfyUI in a subprocess (skipped without --runslow)"
+    )
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="Also run tests marked slow (full ComfyUI startup)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow was given."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow: pass --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 # =============================================================================
@@ -58,24 +84,37 @@ def pytest_configure(config):
 # =============================================================================
 
 
+@pytest.fixture(scope="session")
+def _mock_raw_handle():
+    """One fake LibRaw handle and default image, built once and reset per test."""
+    import numpy as np
+
+    # Create fake 100x100 RGB image; read-only so no test can alter it for others
+    default_rgb = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
+    default_rgb.flags.writeable = False
+    return MagicMock(), default_rgb
+
+
 @pytest.fixture
-def mock_rawpy():
+def mock_rawpy(_mock_raw_handle):
     """Mock rawpy.imread and postprocess for unit testing."""
-    import numpy as np
-    from unittest.mock import MagicMock, patch
-
-    with patch("rawpy.imread") as mock_imread:
-        mock_raw = MagicMock()
-        # Create fake 100x100 RGB image
-        mock_raw.postprocess.return_value = np.random.randint(
-            0, 255, (100, 100, 3), dtype=np.uint8
-        )
+    mock_raw, default_rgb = _mock_raw_handle
+    # Drop calls and any return values/side effects the previous test configured
+    mock_raw.reset_mock(return_value=True, side_effect=True)
+    mock_raw.postprocess.return_value = default_rgb
+
+    # Skip the file read so tests can pass placeholder paths straight to imread.
+    # Patched per test: integration tests in the same session need the real ones.
+    with (
+        patch("raw_processing._read_raw_file", side_effect=lambda path: path),
+        patch("rawpy.imread") as mock_imread,
+    ):
         mock_imread.return_value.__enter__ = MagicMock(return_value=mock_raw)
         mock_imread.return_value.__exit__ = MagicMock(return_value=False)
         yield mock_raw
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_raw_file():
     """Return path to the sample RAW file, skipping if it doesn't exist."""
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -87,6 +126,22 @@ def sample_raw_file():
     return file_path
 
 
+@pytest.fixture(scope="session")
+def decoded_sample(sample_raw_file):
+    """
+    Run LoadRawImage once on the sample file and share its outputs.
+
+    Returns:
+        The node's (image, preview, thumbnail) tensors.
+    """
+    # Lazy import
+    from nodes import LoadRawImage
+
+    # Our sample file is not in the input directory, so resolve it directly
+    with patch("folder_paths.get_annotated_filepath", return_value=sample_raw_file):
+        return tuple(asyncio.run(LoadRawImage().execute(image="placeholder.arw")))
+
+
 # =============================================================================
 # INTEGRATION TEST FIXTURES
 # =============================================================================
@@ -101,6 +156,7 @@ class ComfyUIApiClient:
         import requests
 
         self._requests = requests
+        self._object_info = None
 
     def is_healthy(self):
         """Check if the server is responding."""
@@ -110,11 +166,18 @@ class ComfyUIApiClient:
         except Exception:
             return False
 
-    def get_object_info(self):
-        """Get all registered nodes from the server."""
-        resp = self._requests.get(f"{self.base_url}/object_info", timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+    def get_object_info(self, refresh=False):
+        """
+        Get all registered nodes from the server.
+
+        The payload covers every installed node and does not change while the
+        server runs, so it is fetched once per client unless refresh is set.
+        """
+        if self._object_info is None or refresh:
+            resp = self._requests.get(f"{self.base_url}/object_info", timeout=10)
+            resp.raise_for_status()
+            self._object_info = resp.json()
+        return self._object_info
 
     def node_exists(self, node_name):
         """Check if a specific node is registered."""
@@ -137,3 +200,9 @@ def api_client():
     if not client.is_healthy():
         pytest.skip("ComfyUI server is not running on port 8188")
     return client
+
+
+@pytest.fixture(scope="session")
+def object_info(api_client):
+    """The server's /object_info payload, fetched once for all schema tests."""
+    return api_client.get_object_info()
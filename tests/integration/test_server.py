@@ -18,6 +18,7 @@ class TestServerHealth:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("object_info")  # Share one /object_info fetch under xdist
 class TestNodeRegistration:
     """Verify all RAWpy nodes are correctly registered with ComfyUI."""
 
@@ -26,36 +27,32 @@ class TestNodeRegistration:
         "Load Raw Image Advanced",
     ]
 
-    def test_all_nodes_registered(self, api_client):
+    def test_all_nodes_registered(self, object_info):
         """Check that all expected nodes are available in the server."""
         for node_name in self.EXPECTED_NODES:
-            assert api_client.node_exists(node_name), (
-                f"Node '{node_name}' should be registered"
-            )
+            assert node_name in object_info, f"Node '{node_name}' should be registered"
 
-    def test_node_count(self, api_client):
+    def test_node_count(self, object_info):
         """Verify the correct number of nodes are registered."""
-        info = api_client.get_object_info()
-        registered = [name for name in self.EXPECTED_NODES if name in info]
+        registered = [name for name in self.EXPECTED_NODES if name in object_info]
         assert len(registered) == len(self.EXPECTED_NODES), (
             f"Expected {len(self.EXPECTED_NODES)} nodes, found {len(registered)}"
         )
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("object_info")  # Share one /object_info fetch under xdist
 class TestNodeInputsOutputs:
     """Verify node schemas are correctly defined."""
 
-    def test_load_raw_image_has_image_input(self, api_client):
+    def test_load_raw_image_has_image_input(self, object_info):
         """Verify LoadRawImage has the required 'image' input."""
-        info = api_client.get_object_info()
-        node_info = info.get("Load Raw Image", {})
+        node_info = object_info.get("Load Raw Image", {})
         inputs = node_info.get("input", {}).get("required", {})
         assert "image" in inputs, "LoadRawImage should have 'image' input"
 
-    def test_load_raw_image_has_image_output(self, api_client):
+    def test_load_raw_image_has_image_output(self, object_info):
         """Verify LoadRawImage outputs an IMAGE type."""
-        info = api_client.get_object_info()
-        node_info = info.get("Load Raw Image", {})
+        node_info = object_info.get("Load Raw Image", {})
         outputs = node_info.get("output", [])
         assert "IMAGE" in outputs, "LoadRawImage should output IMAGE type"
@@ -1,5 +1,7 @@
+import importlib.util
 import subprocess
 import os
+import sys
 import pytest
 
 # Calculate paths relative to this test file
@@ -8,7 +10,43 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 COMFY_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", "..", "..", ".."))
 VENV_PYTHON = os.path.join(COMFY_ROOT, "venv", "Scripts", "python.exe")
 
+PACKAGE_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
 
+
+# No server needed: the fast import smoke test belongs in the default unit run
+@pytest.mark.unit
+def test_package_imports_in_process():
+    """Verifies the package __init__ and its nodes import cleanly, in-process."""
+    name = "comfyui_rawpy"
+    module = sys.modules.get(name)
+    if module is None:
+        # The folder name has a dash, so load it under an importable alias
+        spec = importlib.util.spec_from_file_location(
+            name,
+            os.path.join(PACKAGE_DIR, "__init__.py"),
+            submodule_search_locations=[PACKAGE_DIR],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+
+    assert set(module.NODE_CLASS_MAPPINGS) == {
+        "Load Raw Image",
+        "Load Raw Image Advanced",
+    }
+    assert callable(module.comfy_entrypoint)
+
+
+# Boots a whole ComfyUI: opt in with --runslow. Under xdist --dist=loadgroup
+# such tests share one worker.
+@pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.serial
+@pytest.mark.xdist_group("comfyui_server")
 def test_server_startup():
     """Verifies that ComfyUI server starts up correctly with the custom node loaded."""
     if not os.path.exists(VENV_PYTHON):
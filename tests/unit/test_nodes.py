@@ -4,36 +4,79 @@ Unit tests for Node classes in nodes.py.
 These tests verify that ComfyUI inputs are correctly mapped to process_raw arguments.
 """
 
+import asyncio
+import hashlib
 import pytest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import threading
+import time
+
+# tests/conftest.py stubs folder_paths and comfy_api in sys.modules before
+# pytest imports any test module, so nodes.py can be imported at the top.
+import folder_paths
+import nodes
+from nodes import LoadRawImage, LoadRawImageAdvanced, _get_files
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Developed results are memoized per file; start every test cold."""
+    nodes._develop_cached.cache_clear()
+    nodes._thumbnail_cached.cache_clear()
+    yield
+    nodes._develop_cached.cache_clear()
+    nodes._thumbnail_cached.cache_clear()
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    """A stand-in RAW file that folder_paths resolves every image name to."""
+    path = tmp_path / "test.arw"
+    path.write_bytes(b"RAW")
+    folder_paths.get_annotated_filepath.return_value = str(path)
+    return str(path)
+
+
+@pytest.fixture
+def polling_only():
+    """Exercise the stat + TTL listing cache even where watchdog is installed."""
+    with patch("nodes._watch_input_dir", return_value=False):
+        yield
+
+
+@pytest.fixture
+def input_dir_watcher():
+    """Let a test start a real watchdog observer, stopped and forgotten after."""
+    pytest.importorskip("watchdog")
+    yield
+    observer = nodes._FILES_WATCH["observer"]
+    if observer is not None:
+        observer.stop()
+        observer.join()
+    nodes._FILES_WATCH.update(dir=None, observer=None, dirty=True)
 
 
 @pytest.mark.unit
 class TestLoadRawImage:
     """Tests for the simple LoadRawImage node."""
 
-    def test_execute_maps_correctly(self):
+    def test_execute_maps_correctly(self, raw_file):
         """Verify inputs are correctly passed to process_raw."""
-        # Lazy import to ensure mocks are active
-        import folder_paths
-        from nodes import LoadRawImage
-
         with patch("nodes.process_raw") as mock_process:
             # Mock return value (image, preview)
             mock_process.return_value = ("MOCK_IMAGE", "MOCK_PREVIEW")
 
-            # Mock folder_paths
-            folder_paths.get_annotated_filepath.return_value = "/abs/path/to/test.arw"
-
             node = LoadRawImage()
-            result = node.execute(
-                image="test.arw",
-                output_16bit=False,
-                white_balance="daylight",
-                highlight_mode="blend",
-                half_size=True,
+            result = asyncio.run(
+                node.execute(
+                    image="test.arw",
+                    output_16bit=False,
+                    white_balance="daylight",
+                    highlight_mode="blend",
+                    half_size=True,
+                )
             )
 
             # verify generic folder path resolution
@@ -41,7 +84,7 @@ class TestLoadRawImage:
 
             # verify process_raw call
             mock_process.assert_called_once_with(
-                "/abs/path/to/test.arw",
+                raw_file,
                 output_16bit=False,
                 white_balance="daylight",
                 highlight_mode_key="blend",
@@ -52,41 +95,145 @@ class TestLoadRawImage:
             assert result[0] == "MOCK_IMAGE"
             assert result[1] == "MOCK_PREVIEW"
 
-    def test_error_handling(self):
-        """Verify runtime errors are raised."""
-        from nodes import LoadRawImage
+    def test_missing_thumbnail_uses_shared_placeholder(self, tmp_path):
+        """Verify the 1x1 fallback thumbnail is allocated once and reused."""
+        (tmp_path / "a.arw").write_bytes(b"A")
+        (tmp_path / "b.arw").write_bytes(b"B")
+        folder_paths.get_annotated_filepath.side_effect = lambda name: str(
+            tmp_path / name
+        )
+
+        with patch("nodes.process_raw", return_value=(None, None)):
+            with patch(
+                "thumbnail_extraction.is_exiftool_available", return_value=False
+            ):
+                first = asyncio.run(LoadRawImage.execute(image="a.arw"))[2]
+                second = asyncio.run(LoadRawImage.execute(image="b.arw"))[2]
+
+        folder_paths.get_annotated_filepath.side_effect = None
+
+        assert first.shape == (1, 1, 1, 3)
+        assert first is second
+
+    def test_failed_thumbnail_retried(self, raw_file):
+        """Verify a failed extraction isn't memoized, so the next run retries it."""
+        with patch("nodes.process_raw", return_value=("IMG", "PREV")):
+            with patch("thumbnail_extraction.is_exiftool_available", return_value=True):
+                with patch(
+                    "thumbnail_extraction.extract_thumbnail_exiftool",
+                    side_effect=[None, b"JPEG"],
+                ) as mock_extract:
+                    with patch(
+                        "thumbnail_extraction.bytes_to_tensor", return_value="THUMB"
+                    ):
+                        first = asyncio.run(LoadRawImage.execute(image="test.arw"))
+                        second = asyncio.run(LoadRawImage.execute(image="test.arw"))
+                        third = asyncio.run(LoadRawImage.execute(image="test.arw"))
+
+        assert first[2].shape == (1, 1, 1, 3)
+        assert second[2] == third[2] == "THUMB"
+        assert mock_extract.call_count == 2
+
+    def test_repeat_execution_reuses_result(self, raw_file):
+        """Verify identical re-runs hit the cache until settings or file change."""
+        with patch("nodes.process_raw", return_value=("IMG", "PREV")) as mock_process:
+            with patch(
+                "thumbnail_extraction.is_exiftool_available", return_value=False
+            ):
+                first = asyncio.run(LoadRawImage.execute(image="test.arw"))
+                second = asyncio.run(LoadRawImage.execute(image="test.arw"))
+                assert mock_process.call_count == 1
+                assert second[0] is first[0]
+
+                asyncio.run(LoadRawImage.execute(image="test.arw", half_size=True))
+                assert mock_process.call_count == 2
+
+                st = os.stat(raw_file)
+                os.utime(raw_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+                asyncio.run(LoadRawImage.execute(image="test.arw"))
+                assert mock_process.call_count == 3
+
+    def test_thumbnail_extracted_while_developing(self, raw_file):
+        """Verify the ExifTool call overlaps process_raw instead of following it."""
+        # Each side blocks until the other has started; sequential calls time out
+        both_running = threading.Barrier(2, timeout=5)
+
+        def develop(*args, **kwargs):
+            both_running.wait()
+            return ("IMG", "PREV")
+
+        def extract(*args, **kwargs):
+            both_running.wait()  # then report no embedded thumbnail
+
+        with patch("nodes.process_raw", side_effect=develop):
+            with patch("thumbnail_extraction.is_exiftool_available", return_value=True):
+                with patch(
+                    "thumbnail_extraction.extract_thumbnail_exiftool",
+                    side_effect=extract,
+                ):
+                    result = asyncio.run(LoadRawImage.execute(image="test.arw"))
+
+        assert result[0] == "IMG"
+        assert result[2].shape == (1, 1, 1, 3)
+
+    def test_thumbnail_read_natively_without_exiftool(self, raw_file):
+        """Verify a TIFF-based RAW yields its IFD1 thumbnail even without ExifTool."""
+        import io
+        import struct
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (16, 12), color="green").save(buffer, format="JPEG")
+        jpeg = buffer.getvalue()
+        # Header, empty IFD0 at 8 linking to IFD1 at 14, JPEG right after IFD1
+        tiff = b"II*\x00" + struct.pack("<IHI", 8, 0, 14)
+        tiff += struct.pack(
+            "<HHHIIHHIII", 2, 0x0201, 4, 1, 44, 0x0202, 4, 1, len(jpeg), 0
+        )
+        with open(raw_file, "wb") as f:
+            f.write(tiff + jpeg)
+
+        with patch("nodes.process_raw", return_value=("IMG", "PREV")):
+            with patch(
+                "thumbnail_extraction.is_exiftool_available", return_value=False
+            ):
+                result = asyncio.run(LoadRawImage.execute(image="test.arw"))
+
+        assert result[2].shape == (1, 12, 16, 3)
 
+    def test_error_handling(self, raw_file):
+        """Verify runtime errors are raised."""
         with patch("nodes.process_raw") as mock_process:
             mock_process.side_effect = Exception("Corrupt file")
 
             node = LoadRawImage()
             with pytest.raises(RuntimeError, match="Failed to load RAW image"):
-                node.execute(image="bad.arw")
+                asyncio.run(node.execute(image="bad.arw"))
 
 
 @pytest.mark.unit
 class TestLoadRawImageAdvanced:
     """Tests for the advanced node."""
 
-    def test_advanced_mapping(self):
+    def test_advanced_mapping(self, raw_file):
         """Verify all advanced parameters are passed correctly."""
-        from nodes import LoadRawImageAdvanced
-
         with patch("nodes.process_raw") as mock_process:
             mock_process.return_value = (None, None)
 
             node = LoadRawImageAdvanced()
-            node.execute(
-                image="test.arw",
-                custom_wb_r=1.5,
-                custom_wb_g1=1.0,
-                custom_wb_b=2.0,
-                custom_wb_g2=1.0,
-                gamma_power=1.0,
-                gamma_slope=0.0,
-                ca_red_scale=1.01,
-                ca_blue_scale=0.99,
-                noise_thr=5.0,
+            asyncio.run(
+                node.execute(
+                    image="test.arw",
+                    custom_wb_r=1.5,
+                    custom_wb_g1=1.0,
+                    custom_wb_b=2.0,
+                    custom_wb_g2=1.0,
+                    gamma_power=1.0,
+                    gamma_slope=0.0,
+                    ca_red_scale=1.01,
+                    ca_blue_scale=0.99,
+                    noise_thr=5.0,
+                )
             )
 
             call_args = mock_process.call_args
@@ -97,3 +244,147 @@ class TestLoadRawImageAdvanced:
             assert kwargs["gamma"] == (1.0, 0.0)
             assert kwargs["chromatic_aberration"] == (1.01, 0.99)
             assert kwargs["noise_thr"] == 5.0
+
+
+@pytest.mark.unit
+class TestFileListing:
+    """Tests for the input directory scan feeding the image Combo."""
+
+    def test_lists_only_raw_files_recursively(self, tmp_path):
+        """Verify non-RAW files are skipped and subfolders are included."""
+        (tmp_path / "a.ARW").write_bytes(b"")
+        (tmp_path / "notes.txt").write_bytes(b"")
+        # No extension at all, just a name that matches one
+        (tmp_path / "raw").write_bytes(b"")
+        (tmp_path / "DNG").write_bytes(b"")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.dng").write_bytes(b"")
+        (tmp_path / "sub" / "b.png").write_bytes(b"")
+        (tmp_path / "sub" / "c.NRW").write_bytes(b"")
+
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+
+        assert _get_files() == [
+            "a.ARW",
+            os.path.join("sub", "b.dng"),
+            os.path.join("sub", "c.NRW"),
+        ]
+
+    def test_unreadable_folders_skipped(self, tmp_path, polling_only):
+        """Verify a folder that can't be listed is skipped instead of raising."""
+        (tmp_path / "a.nef").write_bytes(b"")
+        (tmp_path / "locked").mkdir()
+        (tmp_path / "locked" / "b.nef").write_bytes(b"")
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+        locked = str(tmp_path / "locked")
+
+        def scandir(path):
+            if path == locked:
+                raise PermissionError(path)
+            return real_scandir(path)
+
+        real_scandir = os.scandir
+        with patch("nodes.os.scandir", side_effect=scandir):
+            assert _get_files() == ["a.nef"]
+
+        # A missing input directory lists nothing
+        folder_paths.get_input_directory.return_value = str(tmp_path / "gone")
+        nodes._FILES_CACHE.update(mtime=None, files=None, ts=0)
+        assert nodes._get_files_cached() == []
+
+    def test_natural_case_insensitive_order(self, tmp_path):
+        """Verify numbered shots sort numerically and case is ignored."""
+        for name in ("IMG_10.dng", "img_2.DNG", "IMG_1.dng", "b.nef", "A.nef"):
+            (tmp_path / name).write_bytes(b"")
+
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+
+        assert _get_files() == [
+            "A.nef",
+            "b.nef",
+            "IMG_1.dng",
+            "img_2.DNG",
+            "IMG_10.dng",
+        ]
+
+    def test_cached_listing_reused(self, tmp_path, polling_only):
+        """Verify repeated queries reuse the scan until the directory changes."""
+        (tmp_path / "a.nef").write_bytes(b"")
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+        nodes._FILES_CACHE.update(mtime=None, files=None, ts=0)
+
+        with patch("nodes._get_files", wraps=nodes._get_files) as mock_scan:
+            assert nodes._get_files_cached() == ["a.nef"]
+            assert nodes._get_files_cached() == ["a.nef"]
+            assert mock_scan.call_count == 1
+
+            # A new file bumps the directory mtime and forces a rescan
+            (tmp_path / "b.nef").write_bytes(b"")
+            os.utime(tmp_path, ns=(0, 0))
+            assert nodes._get_files_cached() == ["a.nef", "b.nef"]
+            assert mock_scan.call_count == 2
+
+    def test_watcher_invalidates_listing(self, tmp_path, input_dir_watcher):
+        """Verify a watched input dir is rescanned on events, not on every query."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.nef").write_bytes(b"")
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+
+        with patch("nodes._get_files", wraps=nodes._get_files) as mock_scan:
+            assert nodes._get_files_cached() == ["a.nef"]
+            assert nodes._get_files_cached() == ["a.nef"]
+            assert mock_scan.call_count == 1
+
+            # Nested changes leave the top-level mtime alone but still register
+            (tmp_path / "sub" / "b.nef").write_bytes(b"")
+            deadline = time.monotonic() + 5
+            while not nodes._FILES_WATCH["dirty"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert nodes._get_files_cached() == [
+                "a.nef",
+                os.path.join("sub", "b.nef"),
+            ]
+            assert mock_scan.call_count == 2
+
+    def test_schema_rebuilt_only_when_files_change(self, tmp_path, polling_only):
+        """Verify define_schema reuses the Schema while the file list is unchanged."""
+        (tmp_path / "a.cr3").write_bytes(b"")
+        folder_paths.get_input_directory.return_value = str(tmp_path)
+        nodes._FILES_CACHE.update(mtime=None, files=None, ts=0)
+        nodes._SCHEMA_CACHE.clear()
+
+        with patch.object(
+            LoadRawImageAdvanced, "_build_schema", return_value="SCHEMA"
+        ) as mock_build:
+            assert LoadRawImageAdvanced.define_schema() == "SCHEMA"
+            assert LoadRawImageAdvanced.define_schema() == "SCHEMA"
+            mock_build.assert_called_once_with(["a.cr3"])
+
+            (tmp_path / "b.cr3").write_bytes(b"")
+            os.utime(tmp_path, ns=(0, 0))
+            LoadRawImageAdvanced.define_schema()
+            mock_build.assert_called_with(["a.cr3", "b.cr3"])
+            assert mock_build.call_count == 2
+
+
+@pytest.mark.unit
+class TestFingerprintInputs:
+    """Tests for change detection on the selected RAW file."""
+
+    def test_digest_cached_until_file_changes(self, tmp_path):
+        """Verify the file is hashed once and re-hashed after modification."""
+        raw_file = tmp_path / "a.arw"
+        raw_file.write_bytes(b"first")
+        folder_paths.get_annotated_filepath.return_value = str(raw_file)
+
+        with patch("nodes.open", create=True, wraps=open) as mock_open:
+            first = LoadRawImage.fingerprint_inputs(image="a.arw")
+            assert LoadRawImage.fingerprint_inputs(image="a.arw") == first
+            assert mock_open.call_count == 1
+
+            raw_file.write_bytes(b"second!")
+            second = LoadRawImage.fingerprint_inputs(image="a.arw")
+            assert mock_open.call_count == 2
+
+        assert first == hashlib.sha256(b"first").hexdigest()
+        assert second == hashlib.sha256(b"second!").hexdigest()
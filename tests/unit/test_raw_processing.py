@@ -4,16 +4,94 @@ Unit tests for isolated RAW processing logic.
 These tests import `raw_processing` directly, avoiding all ComfyUI dependencies.
 """
 
+import io
+import threading
 import pytest
 import numpy as np
+import rawpy
 import torch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from PIL import Image
+import raw_processing
 from raw_processing import (
     process_raw,
+    _build_pp_args,
+    _read_raw_file,
     DEMOSAIC_ALGORITHMS,
+    FBDD_MODES,
+    ORIENTATION_MAP,
     OUTPUT_COLORSPACES,
     HIGHLIGHT_MODES,
 )
 
+# (process_raw kwargs, postprocess kwargs they must produce)
+PASSTHROUGH_CASES = [
+    pytest.param(
+        {"white_balance": "custom", "custom_wb": (1.5, 1.0, 1.2, 1.0)},
+        {"user_wb": [1.5, 1.0, 1.2, 1.0]},
+        id="custom_white_balance",
+    ),
+    pytest.param(
+        {"demosaic_key": "AMAZE"},
+        {"demosaic_algorithm": DEMOSAIC_ALGORITHMS["AMAZE"]},
+        id="demosaic_algorithm",
+    ),
+    pytest.param(
+        {"exp_shift": 2.0, "exp_preserve_highlights": 0.5},
+        {"exp_shift": 2.0, "exp_preserve_highlights": 0.5},
+        id="exposure_shift",
+    ),
+    pytest.param(
+        {"noise_thr": 10.5, "fbdd_noise_reduction": "light", "median_filter_passes": 3},
+        {
+            "noise_thr": 10.5,
+            "fbdd_noise_reduction": FBDD_MODES["light"],
+            "median_filter_passes": 3,
+        },
+        id="denoising",
+    ),
+    pytest.param({"half_size": True}, {"half_size": True}, id="half_size"),
+    pytest.param(
+        {"orientation_key": "90° CW"},
+        {"user_flip": ORIENTATION_MAP["90° CW"]},
+        id="orientation",
+    ),
+    pytest.param(
+        {"colorspace_key": "Adobe RGB"},
+        {"output_color": OUTPUT_COLORSPACES["Adobe RGB"]},
+        id="colorspace",
+    ),
+    pytest.param({"gamma": (1.0, 1.0)}, {"gamma": (1.0, 1.0)}, id="gamma"),
+    pytest.param(
+        {"chromatic_aberration": (1.1, 0.9)},
+        {"chromatic_aberration": (1.1, 0.9)},
+        id="chromatic_aberration",
+    ),
+]
+
+
+def _constant(shape, value, dtype):
+    """A read-only filled array, safe to share between tests."""
+    array = np.full(shape, value, dtype=dtype)
+    array.setflags(write=False)
+    return array
+
+
+# Saturated postprocess outputs and bitmap thumbnails reused across tests
+_U16_SAT = _constant((10, 10, 3), 65535, np.uint16)
+_U8_SAT = _constant((10, 10, 3), 255, np.uint8)
+_BMP_20 = _constant((20, 20, 3), 255, np.uint8)
+_BMP_2D = _constant((10, 10), 128, np.uint8)
+
+
+@pytest.fixture(scope="session")
+def red_jpeg_bytes():
+    """A 50x50 solid red JPEG, encoded once per session."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (50, 50), color="red").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
 
 @pytest.mark.unit
 class TestRawProcessing:
@@ -33,56 +111,112 @@ class TestRawProcessing:
         # Preview should be 1x1 black pixel by default in mock if not set
         assert preview.shape == (1, 1, 1, 3)
 
+    def test_raw_file_read_into_buffer(self, tmp_path):
+        """Verify the RAW file is read in full and handed over as a buffer."""
+        raw_file = tmp_path / "test.arw"
+        raw_file.write_bytes(b"II*\x00rawdata")
+
+        buffer = _read_raw_file(str(raw_file))
+
+        assert buffer.read() == b"II*\x00rawdata"
+
     def test_16bit_normalization(self, mock_rawpy):
         """Verify 16-bit values are normalized to [0, 1]."""
-        mock_rawpy.postprocess.return_value = np.full(
-            (10, 10, 3), 65535, dtype=np.uint16
-        )
+        mock_rawpy.postprocess.return_value = _U16_SAT
         image, _ = process_raw("test.arw", output_16bit=True)
         assert image.max() == pytest.approx(1.0, rel=0.01)
 
     def test_8bit_normalization(self, mock_rawpy):
         """Verify 8-bit values are normalized to [0, 1]."""
-        mock_rawpy.postprocess.return_value = np.full((10, 10, 3), 255, dtype=np.uint8)
+        mock_rawpy.postprocess.return_value = _U8_SAT
         image, _ = process_raw("test.arw", output_16bit=False)
         assert image.max() == pytest.approx(1.0, rel=0.01)
+        # ComfyUI IMAGE tensors are float32 regardless of the source bit depth
+        assert image.dtype == torch.float32
 
-    def test_custom_white_balance_passed(self, mock_rawpy):
-        """Verify custom white balance values are passed to rawpy."""
-        process_raw("test.arw", white_balance="custom", custom_wb=(1.5, 1.0, 1.2, 1.0))
-        mock_rawpy.postprocess.assert_called_once()
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["user_wb"] == [1.5, 1.0, 1.2, 1.0]
+    def test_pin_memory_without_cuda(self, mock_rawpy):
+        """Verify pin_memory is ignored rather than failing on CPU-only hosts."""
+        mock_rawpy.postprocess.return_value = np.full((4, 6, 3), 65535, dtype=np.uint16)
+        with patch("torch.cuda.is_available", return_value=False):
+            image, _ = process_raw("test.arw", pin_memory=True)
+        assert image.shape == (1, 4, 6, 3)
+        assert not image.is_pinned()
+        assert torch.all(image == 1.0)
+
+    def test_defer_float_cast_returns_integer_image(self, mock_rawpy):
+        """Verify the postprocess output is passed through without scaling."""
+        rgb = np.full((4, 6, 3), 4096, dtype=np.uint16)
+        mock_rawpy.postprocess.return_value = rgb
+        image, preview = process_raw("test.arw", defer_float_cast=True)
+        assert image.shape == (1, 4, 6, 3)
+        assert image.dtype == torch.uint16
+        assert np.shares_memory(image.numpy(), rgb)
+        assert preview.dtype == torch.float32
+
+    def test_developed_image_skips_pil(self, mock_rawpy):
+        """Verify the postprocess output goes straight to torch, without PIL."""
+        mock_rawpy.postprocess.return_value = np.full((4, 6, 3), 51, dtype=np.uint8)
+        with patch("PIL.Image.fromarray", side_effect=AssertionError("PIL used")):
+            image, _ = process_raw("test.arw", output_16bit=False)
+        assert image.shape == (1, 4, 6, 3)
+        assert image[0, 0, 0, 0].item() == pytest.approx(0.2)
+
+    def test_parallel_normalize_matches_single_pass(self, mock_rawpy):
+        """Verify row-split normalization gives exactly the single-pass result."""
+        rgb = np.random.randint(0, 65536, size=(37, 5, 3), dtype=np.uint16)
+        mock_rawpy.postprocess.return_value = rgb
+        expected = np.multiply(rgb, np.float32(1.0 / 65535.0), dtype=np.float32)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            with patch.multiple(
+                raw_processing,
+                _NORMALIZE_POOL=pool,
+                _NORMALIZE_WORKERS=4,
+                _PARALLEL_MIN_SIZE=0,
+            ):
+                image, _ = process_raw("test.arw", output_16bit=True)
+
+        assert np.array_equal(image[0].numpy(), expected)
+
+    def test_planar_output(self, mock_rawpy):
+        """Verify channels_last=False yields a contiguous NCHW image."""
+        rgb = np.random.randint(0, 256, size=(4, 6, 3), dtype=np.uint8)
+        mock_rawpy.postprocess.return_value = rgb
 
-    def test_demosaic_algorithm_passed(self, mock_rawpy):
-        """Verify demosaic algorithm enum is correctly resolved."""
-        process_raw("test.arw", demosaic_key="AMAZE")
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["demosaic_algorithm"] == DEMOSAIC_ALGORITHMS["AMAZE"]
+        image, preview = process_raw(
+            "test.arw", output_16bit=False, channels_last=False
+        )
 
-    def test_exposure_shift_passed(self, mock_rawpy):
-        """Verify exposure shift parameters are forwarded."""
-        process_raw("test.arw", exp_shift=2.0, exp_preserve_highlights=0.5)
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["exp_shift"] == 2.0
-        assert call_args.kwargs["exp_preserve_highlights"] == 0.5
+        assert image.shape == (1, 3, 4, 6)
+        assert image.is_contiguous()
+        expected = np.multiply(rgb, np.float32(1.0 / 255.0), dtype=np.float32)
+        assert np.array_equal(image[0].numpy(), expected.transpose(2, 0, 1))
+        assert preview.shape[-1] == 3
 
-    def test_extract_jpeg_thumbnail(self, mock_rawpy):
-        """Verify JPEG thumbnail extraction."""
-        import rawpy
-        from unittest.mock import MagicMock
-        from PIL import Image
-        import io
+    @pytest.mark.parametrize("kwargs,expected", PASSTHROUGH_CASES)
+    def test_kwarg_passthrough(self, mock_rawpy, kwargs, expected):
+        """Verify node settings reach rawpy's postprocess as resolved kwargs."""
+        process_raw("test.arw", **kwargs)
+        mock_rawpy.postprocess.assert_called_once()
+        call_kwargs = mock_rawpy.postprocess.call_args.kwargs
+        for key, value in expected.items():
+            assert call_kwargs[key] == value, key
+
+    def test_postprocess_args_reused_across_calls(self, mock_rawpy):
+        """Verify identical settings are resolved to postprocess kwargs once."""
+        _build_pp_args.cache_clear()
+        process_raw("a.arw", white_balance="custom", custom_wb=[2.0, 1.0, 1.5, 1.0])
+        process_raw("b.arw", white_balance="custom", custom_wb=(2.0, 1.0, 1.5, 1.0))
 
-        # Create a fake JPEG
-        img = Image.new("RGB", (50, 50), color="red")
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format="JPEG")
-        jpeg_bytes = img_byte_arr.getvalue()
+        assert _build_pp_args.cache_info().misses == 1
+        first, second = mock_rawpy.postprocess.call_args_list
+        assert first.kwargs == second.kwargs
 
+    def test_extract_jpeg_thumbnail(self, mock_rawpy, red_jpeg_bytes):
+        """Verify JPEG thumbnail extraction."""
         mock_thumb = MagicMock()
         mock_thumb.format = rawpy.ThumbFormat.JPEG
-        mock_thumb.data = jpeg_bytes
+        mock_thumb.data = red_jpeg_bytes
 
         mock_rawpy.extract_thumb.return_value = mock_thumb
 
@@ -93,15 +227,42 @@ class TestRawProcessing:
         assert preview[0, 0, 0, 0] > 0.9
         assert preview[0, 0, 0, 1] < 0.1
 
+    def test_jpeg_thumbnail_without_pillow(self, mock_rawpy):
+        """Verify a missing Pillow degrades to the placeholder preview."""
+        mock_thumb = MagicMock()
+        mock_thumb.format = rawpy.ThumbFormat.JPEG
+        mock_thumb.data = b"not decoded"
+        mock_rawpy.extract_thumb.return_value = mock_thumb
+
+        with patch("raw_processing.Image", None):
+            with patch("raw_processing._turbo_jpeg", None):
+                _, preview = process_raw("test.arw")
+
+        assert preview.shape == (1, 1, 1, 3)
+
+    def test_jpeg_thumbnail_prefers_turbojpeg(self, mock_rawpy):
+        """Verify libjpeg-turbo's decoded array is used when it is available."""
+        mock_thumb = MagicMock()
+        mock_thumb.format = rawpy.ThumbFormat.JPEG
+        mock_thumb.data = b"jpeg"
+        mock_rawpy.extract_thumb.return_value = mock_thumb
+
+        turbo = MagicMock()
+        turbo.decode.return_value = np.full((8, 12, 3), 255, dtype=np.uint8)
+        with patch("raw_processing._turbo_jpeg", turbo):
+            with patch("raw_processing.TJPF_RGB", 0, create=True):
+                _, preview = process_raw("test.arw")
+
+        turbo.decode.assert_called_once_with(b"jpeg", pixel_format=0)
+        assert preview.shape == (1, 8, 12, 3)
+        assert torch.all(preview == 1.0)
+
     def test_extract_bitmap_thumbnail(self, mock_rawpy):
         """Verify Bitmap thumbnail extraction."""
-        import rawpy
-        from unittest.mock import MagicMock
-
         mock_thumb = MagicMock()
         mock_thumb.format = rawpy.ThumbFormat.BITMAP
         # Create a fake 20x20 RGB bitmap
-        mock_thumb.data = np.full((20, 20, 3), 255, dtype=np.uint8)
+        mock_thumb.data = _BMP_20
 
         mock_rawpy.extract_thumb.return_value = mock_thumb
 
@@ -109,6 +270,28 @@ class TestRawProcessing:
 
         assert preview.shape == (1, 20, 20, 3)
         assert preview.max() == pytest.approx(1.0)
+        assert preview.dtype == torch.float32
+
+    def test_preview_decoded_during_postprocess(self, mock_rawpy):
+        """Verify the preview decode overlaps LibRaw's postprocess."""
+        # Each side blocks until the other has started; sequential calls time out
+        both_running = threading.Barrier(2, timeout=5)
+        rgb = np.zeros((4, 4, 3), dtype=np.uint16)
+
+        def develop(**kwargs):
+            both_running.wait()
+            return rgb
+
+        def decode(thumb):
+            both_running.wait()
+            return torch.zeros((1, 2, 2, 3))
+
+        mock_rawpy.postprocess.side_effect = develop
+        with patch.object(raw_processing, "_thumbnail_tensor", side_effect=decode):
+            image, preview = process_raw("test.arw")
+
+        assert image.shape == (1, 4, 4, 3)
+        assert preview.shape == (1, 2, 2, 3)
 
     def test_no_thumbnail_fallback(self, mock_rawpy):
         """Verify fallback when extract_thumb fails or returns None."""
@@ -120,54 +303,20 @@ class TestRawProcessing:
         assert preview.shape == (1, 1, 1, 3)
         assert preview.max() == 0.0
 
-    def test_denoising_params_passed(self, mock_rawpy):
-        """Verify denoising parameters are forwarded."""
-        from raw_processing import FBDD_MODES
-
+    def test_preview_only_overrides_quality_settings(self, mock_rawpy):
+        """Verify preview_only forces the cheap half-size path."""
         process_raw(
             "test.arw",
-            noise_thr=10.5,
-            fbdd_noise_reduction="light",
+            demosaic_key="AMAZE",
             median_filter_passes=3,
+            fbdd_noise_reduction="full",
+            preview_only=True,
         )
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["noise_thr"] == 10.5
-        assert call_args.kwargs["fbdd_noise_reduction"] == FBDD_MODES["light"]
-        assert call_args.kwargs["median_filter_passes"] == 3
-
-    def test_half_size_passed(self, mock_rawpy):
-        """Verify half_size parameter is forwarded."""
-        process_raw("test.arw", half_size=True)
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["half_size"] is True
-
-    def test_orientation_passed(self, mock_rawpy):
-        """Verify orientation parameter is forwarded."""
-        from raw_processing import ORIENTATION_MAP
-
-        process_raw("test.arw", orientation_key="90° CW")
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["user_flip"] == ORIENTATION_MAP["90° CW"]
-
-    def test_colorspace_passed(self, mock_rawpy):
-        """Verify colorspace parameter is forwarded."""
-        from raw_processing import OUTPUT_COLORSPACES
-
-        process_raw("test.arw", colorspace_key="Adobe RGB")
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["output_color"] == OUTPUT_COLORSPACES["Adobe RGB"]
-
-    def test_gamma_passed(self, mock_rawpy):
-        """Verify gamma tuple is forwarded."""
-        process_raw("test.arw", gamma=(1.0, 1.0))
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["gamma"] == (1.0, 1.0)
-
-    def test_chromatic_aberration_passed(self, mock_rawpy):
-        """Verify CA tuple is forwarded."""
-        process_raw("test.arw", chromatic_aberration=(1.1, 0.9))
-        call_args = mock_rawpy.postprocess.call_args
-        assert call_args.kwargs["chromatic_aberration"] == (1.1, 0.9)
+        kwargs = mock_rawpy.postprocess.call_args.kwargs
+        assert kwargs["half_size"] is True
+        assert kwargs["demosaic_algorithm"] == rawpy.DemosaicAlgorithm.LINEAR
+        assert kwargs["median_filter_passes"] == 0
+        assert kwargs["fbdd_noise_reduction"] == rawpy.FBDDNoiseReductionMode.Off
 
     def test_auto_wb_flag(self, mock_rawpy):
         """Verify use_auto_wb flag is set."""
@@ -178,13 +327,10 @@ class TestRawProcessing:
 
     def test_thumbnail_dimensions_correction(self, mock_rawpy):
         """Verify 2D thumbnail is expanded to 3D."""
-        import rawpy
-        from unittest.mock import MagicMock
-
         mock_thumb = MagicMock()
         mock_thumb.format = rawpy.ThumbFormat.BITMAP
         # Create a single channel 2D image
-        mock_thumb.data = np.full((10, 10), 128, dtype=np.uint8)
+        mock_thumb.data = _BMP_2D
 
         mock_rawpy.extract_thumb.return_value = mock_thumb
 
@@ -193,3 +339,5 @@ class TestRawProcessing:
         assert preview.shape == (1, 10, 10, 3)
         # Should be grayscale (all channels equal)
         assert preview[0, 0, 0, 0] == preview[0, 0, 0, 1] == preview[0, 0, 0, 2]
+        # Materialized, not a stride-0 view sharing one plane
+        assert preview.is_contiguous()
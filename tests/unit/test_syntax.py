@@ -10,36 +10,46 @@ import ast
 import os
 
 
+@pytest.fixture(scope="session")
+def parsed_sources():
+    """
+    (path, source, tree) for each Python file in the package root.
+
+    Read and parsed once per session; tree is None if the file fails to parse.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    sources = []
+    for filename in os.listdir(package_root):
+        if filename.endswith(".py") and not filename.startswith("_"):
+            filepath = os.path.join(package_root, filename)
+            with open(filepath, "r", encoding="utf-8") as f:
+                source = f.read()
+            try:
+                tree = ast.parse(source)
+            except SyntaxError:
+                tree = None
+            sources.append((filepath, source, tree))
+    return sources
+
+
 @pytest.mark.unit
 class TestSyntax:
     """Validate Python syntax across all source files."""
 
-    @pytest.fixture
-    def source_files(self):
-        """Get all Python files in the package root."""
-        package_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        python_files = []
-        for filename in os.listdir(package_root):
-            if filename.endswith(".py") and not filename.startswith("_"):
-                python_files.append(os.path.join(package_root, filename))
-        return python_files
-
-    def test_all_files_parse(self, source_files):
+    def test_all_files_parse(self, parsed_sources):
         """Verify all Python files are syntactically valid."""
-        for filepath in source_files:
-            with open(filepath, "r", encoding="utf-8") as f:
-                source = f.read()
-            try:
-                ast.parse(source)
-            except SyntaxError as e:
-                pytest.fail(f"Syntax error in {filepath}: {e}")
-
-    def test_no_print_statements_in_production(self, source_files):
+        for filepath, source, tree in parsed_sources:
+            if tree is None:
+                try:
+                    ast.parse(source)
+                except SyntaxError as e:
+                    pytest.fail(f"Syntax error in {filepath}: {e}")
+
+    def test_no_print_statements_in_production(self, parsed_sources):
         """Check for debug print statements (optional warning)."""
-        for filepath in source_files:
-            with open(filepath, "r", encoding="utf-8") as f:
-                source = f.read()
-            tree = ast.parse(source)
+        for filepath, _, tree in parsed_sources:
+            if tree is None:
+                continue  # Reported by test_all_files_parse
 
             for node in ast.walk(tree):
                 if isinstance(node, ast.Call):
@@ -3,11 +3,44 @@ Unit tests for ExifTool-based thumbnail extraction.
 """
 
 import pytest
+from contextlib import nullcontext
 from unittest.mock import patch, MagicMock
 import numpy as np
+import struct
 import torch
 
 
+def _tiff_with_thumbnail(endian, jpeg):
+    """A minimal TIFF whose IFD1 points at the given JPEG bytes."""
+    byte_order = b"II*\x00" if endian == "<" else b"MM\x00*"
+    # IFD0 at 8 holds one SHORT tag (18 bytes); IFD1 at 26 holds two LONGs (30)
+    ifd0 = struct.pack(endian + "H", 1)
+    ifd0 += struct.pack(endian + "HHIH2x", 0x0100, 3, 1, 160)
+    ifd0 += struct.pack(endian + "I", 26)
+    ifd1 = struct.pack(endian + "H", 2)
+    ifd1 += struct.pack(endian + "HHII", 0x0201, 4, 1, 56)
+    ifd1 += struct.pack(endian + "HHII", 0x0202, 4, 1, len(jpeg))
+    ifd1 += struct.pack(endian + "I", 0)
+    return byte_order + struct.pack(endian + "I", 8) + ifd0 + ifd1 + jpeg
+
+
+@pytest.fixture(autouse=True)
+def reset_exiftool_probe():
+    """The availability probe is memoized; keep mocked results out of other tests."""
+    from thumbnail_extraction import (
+        _exiftool_executable,
+        _thumbnails_cached,
+        is_exiftool_available,
+    )
+
+    memoized = (is_exiftool_available, _exiftool_executable, _thumbnails_cached)
+    for func in memoized:
+        func.cache_clear()
+    yield
+    for func in memoized:
+        func.cache_clear()
+
+
 @pytest.mark.unit
 class TestThumbnailExtraction:
     """Tests for the thumbnail_extraction module."""
@@ -27,16 +60,29 @@ class TestThumbnailExtraction:
         with patch("subprocess.run", side_effect=FileNotFoundError):
             assert is_exiftool_available() is False
 
+    def test_is_exiftool_available_probed_once(self):
+        """Test availability is checked with one subprocess per process."""
+        from thumbnail_extraction import is_exiftool_available
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            assert is_exiftool_available() is True
+            assert is_exiftool_available() is True
+        mock_run.assert_called_once()
+
     def test_extract_thumbnail_exiftool_success(self):
         """Test successful thumbnail extraction."""
         from thumbnail_extraction import extract_thumbnail_exiftool
 
         fake_jpeg_bytes = b"\xff\xd8\xff\xe0" + b"\x00" * 100  # Fake JPEG header
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout=fake_jpeg_bytes)
-            result = extract_thumbnail_exiftool("test.arw", "ThumbnailImage")
-            assert result == fake_jpeg_bytes
+        with patch(
+            "thumbnail_extraction._exiftool_worker", return_value=nullcontext(None)
+        ):
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0, stdout=fake_jpeg_bytes)
+                result = extract_thumbnail_exiftool("test.arw", "ThumbnailImage")
+                assert result == fake_jpeg_bytes
 
     def test_extract_thumbnail_exiftool_failure(self):
         """Test graceful failure when extraction fails."""
@@ -44,10 +90,481 @@ class TestThumbnailExtraction:
         import subprocess
 
         with patch(
-            "subprocess.run", side_effect=subprocess.CalledProcessError(1, "exiftool")
+            "thumbnail_extraction._exiftool_worker", return_value=nullcontext(None)
+        ):
+            with patch(
+                "subprocess.run",
+                side_effect=subprocess.CalledProcessError(1, "exiftool"),
+            ):
+                result = extract_thumbnail_exiftool("test.arw", "ThumbnailImage")
+                assert result is None
+
+    def test_extract_thumbnail_uses_persistent_exiftool(self):
+        """Test extraction goes through the stay_open process when available."""
+        from thumbnail_extraction import extract_thumbnail_exiftool
+
+        mock_exiftool = MagicMock()
+        mock_exiftool.execute.return_value = b"\xff\xd8JPEG"
+
+        with patch(
+            "thumbnail_extraction._exiftool_worker",
+            return_value=nullcontext(mock_exiftool),
+        ):
+            with patch("subprocess.run") as mock_run:
+                result = extract_thumbnail_exiftool("test.arw", "PreviewImage")
+
+        assert result == b"\xff\xd8JPEG"
+        mock_exiftool.execute.assert_called_once_with(
+            "-fast", "-b", "-PreviewImage", "test.arw"
+        )
+        mock_run.assert_not_called()
+
+    def test_extract_after_timeout_skips_one_shot(self):
+        """Test a file that hung ExifTool is not retried in a one-shot process."""
+        from thumbnail_extraction import (
+            extract_thumbnail_exiftool,
+            extract_thumbnails_exiftool_batch,
+        )
+
+        mock_exiftool = MagicMock()
+        mock_exiftool.execute.side_effect = TimeoutError
+        with patch(
+            "thumbnail_extraction._exiftool_worker",
+            side_effect=lambda: nullcontext(mock_exiftool),
+        ):
+            with patch("subprocess.run") as mock_run:
+                single = extract_thumbnail_exiftool("test.arw", "PreviewImage")
+                batch = extract_thumbnails_exiftool_batch(
+                    ["a.arw", "b.arw"], ["PreviewImage"]
+                )
+
+        assert single is None
+        assert batch == [{"PreviewImage": None}, {"PreviewImage": None}]
+        mock_run.assert_not_called()
+
+    def test_extract_thumbnails_single_command(self):
+        """Test several tags come back from one ExifTool command as JSON."""
+        import base64
+        import json
+        from thumbnail_extraction import extract_thumbnails_exiftool
+
+        mock_exiftool = MagicMock()
+        mock_exiftool.execute.return_value = json.dumps(
+            [
+                {
+                    "SourceFile": "test.arw",
+                    "ThumbnailImage": "base64:" + base64.b64encode(b"THUMB").decode(),
+                    "PreviewImage": "base64:" + base64.b64encode(b"PREVIEW").decode(),
+                }
+            ]
+        ).encode()
+
+        with patch(
+            "thumbnail_extraction._exiftool_worker",
+            return_value=nullcontext(mock_exiftool),
         ):
-            result = extract_thumbnail_exiftool("test.arw", "ThumbnailImage")
-            assert result is None
+            images = extract_thumbnails_exiftool("test.arw")
+
+        assert images == {
+            "ThumbnailImage": b"THUMB",
+            "PreviewImage": b"PREVIEW",
+            "JpgFromRaw": None,
+        }
+        mock_exiftool.execute.assert_called_once_with(
+            "-fast",
+            "-j",
+            "-b",
+            "-ThumbnailImage",
+            "-PreviewImage",
+            "-JpgFromRaw",
+            "test.arw",
+            timeout=10,
+        )
+
+    def test_extract_thumbnails_unreadable_output(self):
+        """Test a failed one-shot call reports every tag as missing."""
+        from thumbnail_extraction import extract_thumbnails_exiftool
+
+        with patch(
+            "thumbnail_extraction._exiftool_worker", return_value=nullcontext(None)
+        ):
+            with patch("subprocess.run", side_effect=FileNotFoundError):
+                images = extract_thumbnails_exiftool("test.arw", ["PreviewImage"])
+
+        assert images == {"PreviewImage": None}
+
+    def test_extract_thumbnails_batch_matches_source_files(self):
+        """Test one command covers every file and records are matched by path."""
+        import base64
+        import json
+        from thumbnail_extraction import extract_thumbnails_exiftool_batch
+
+        # b.arw could not be read, so ExifTool emits no record for it
+        mock_exiftool = MagicMock()
+        mock_exiftool.execute.return_value = json.dumps(
+            [
+                {
+                    "SourceFile": "c.arw",
+                    "PreviewImage": "base64:" + base64.b64encode(b"C").decode(),
+                },
+                {
+                    "SourceFile": "a.arw",
+                    "PreviewImage": "base64:" + base64.b64encode(b"A").decode(),
+                },
+            ]
+        ).encode()
+
+        with patch(
+            "thumbnail_extraction._exiftool_worker",
+            return_value=nullcontext(mock_exiftool),
+        ):
+            results = extract_thumbnails_exiftool_batch(
+                ["a.arw", "b.arw", "c.arw"], ["PreviewImage"]
+            )
+
+        assert results == [
+            {"PreviewImage": b"A"},
+            {"PreviewImage": None},
+            {"PreviewImage": b"C"},
+        ]
+        mock_exiftool.execute.assert_called_once_with(
+            "-fast",
+            "-j",
+            "-b",
+            "-PreviewImage",
+            "a.arw",
+            "b.arw",
+            "c.arw",
+            timeout=30,
+        )
+
+    def test_extract_all_thumbnails_decodes_in_parallel(self):
+        """Test the embedded images of one file are decoded concurrently."""
+        import threading
+        import thumbnail_extraction
+
+        # Every decode blocks until all three have started; serial decodes time out
+        all_running = threading.Barrier(3, timeout=5)
+
+        def decode(data, device=None):
+            all_running.wait()
+            return data
+
+        images = {"ThumbnailImage": b"T", "PreviewImage": b"P", "JpgFromRaw": b"J"}
+        with patch.object(
+            thumbnail_extraction,
+            "extract_thumbnails_exiftool_batch",
+            return_value=[images],
+        ):
+            with patch.object(
+                thumbnail_extraction, "bytes_to_tensor", side_effect=decode
+            ):
+                result = thumbnail_extraction.extract_all_thumbnails("test.arw")
+
+        assert result == (b"T", b"P", b"J")
+
+    def test_extract_all_thumbnails_cached_per_file_version(self, tmp_path):
+        """Test re-running on an unchanged file skips ExifTool and the decode."""
+        import os
+        import thumbnail_extraction
+
+        raw_file = tmp_path / "test.arw"
+        raw_file.write_bytes(b"RAW")
+        images = {"ThumbnailImage": b"T", "PreviewImage": None, "JpgFromRaw": None}
+        with patch.object(
+            thumbnail_extraction,
+            "extract_thumbnails_exiftool_batch",
+            return_value=[images],
+        ) as mock_batch:
+            with patch.object(
+                thumbnail_extraction, "bytes_to_tensor", side_effect=lambda d, _: d
+            ) as mock_decode:
+                first = thumbnail_extraction.extract_all_thumbnails(str(raw_file))
+                second = thumbnail_extraction.extract_all_thumbnails(str(raw_file))
+                assert mock_batch.call_count == 1
+                assert mock_decode.call_count == 1
+
+                # A rewritten file is a new version
+                st = raw_file.stat()
+                os.utime(raw_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+                thumbnail_extraction.extract_all_thumbnails(str(raw_file))
+                assert mock_batch.call_count == 2
+
+        assert first is second == (b"T", None, None)
+
+    def test_extract_thumbnails_stacked(self):
+        """Test several files land in one zero-padded batch from one ExifTool call."""
+        import thumbnail_extraction
+        from PIL import Image
+        import io
+
+        def png(size, color):
+            buffer = io.BytesIO()
+            Image.new("RGB", size, color=color).save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        per_file = [
+            {"ThumbnailImage": png((6, 2), "white")},
+            {"ThumbnailImage": None},
+            {"ThumbnailImage": png((3, 4), (255, 0, 0))},
+        ]
+        with patch.object(
+            thumbnail_extraction,
+            "extract_thumbnails_exiftool_batch",
+            return_value=per_file,
+        ) as mock_batch:
+            images, sizes = thumbnail_extraction.extract_thumbnails_stacked(
+                ["a.arw", "b.arw", "c.arw"]
+            )
+
+        mock_batch.assert_called_once_with(
+            ["a.arw", "b.arw", "c.arw"], ("ThumbnailImage",)
+        )
+        assert sizes == [(2, 6), (0, 0), (4, 3)]
+        assert images.shape == (3, 4, 6, 3)
+        assert images.is_contiguous()
+        assert torch.all(images[0, :2] == 1.0)
+        assert torch.all(images[0, 2:] == 0.0)
+        assert torch.all(images[1] == 0.0)
+        assert torch.all(images[2, :, :3, 0] == 1.0)
+        assert torch.all(images[2, :, 3:] == 0.0)
+
+    def test_extract_all_thumbnails_failure_not_cached(self, tmp_path):
+        """Test a failed extraction is retried instead of memoized."""
+        import thumbnail_extraction
+
+        raw_file = tmp_path / "test.arw"
+        raw_file.write_bytes(b"RAW")
+        failed = {"ThumbnailImage": None, "PreviewImage": None, "JpgFromRaw": None}
+        found = dict(failed, ThumbnailImage=b"T")
+        with patch.object(
+            thumbnail_extraction,
+            "extract_thumbnails_exiftool_batch",
+            side_effect=[[failed], [found]],
+        ) as mock_batch:
+            with patch.object(
+                thumbnail_extraction, "bytes_to_tensor", side_effect=lambda d, _: d
+            ):
+                first = thumbnail_extraction.extract_all_thumbnails(str(raw_file))
+                second = thumbnail_extraction.extract_all_thumbnails(str(raw_file))
+
+        assert first == (None, None, None)
+        assert second == (b"T", None, None)
+        assert mock_batch.call_count == 2
+
+    @pytest.mark.parametrize("endian", ["<", ">"], ids=["II", "MM"])
+    def test_extract_thumbnail_native(self, tmp_path, endian):
+        """Test the IFD1 JPEG is sliced out of a TIFF-based RAW in either byte order."""
+        from thumbnail_extraction import extract_thumbnail_native
+
+        jpeg = b"\xff\xd8JPEG\xff\xd9"
+        raw_file = tmp_path / "test.arw"
+        raw_file.write_bytes(_tiff_with_thumbnail(endian, jpeg))
+
+        assert extract_thumbnail_native(str(raw_file)) == jpeg
+        # Maker-specific images are left to ExifTool
+        assert extract_thumbnail_native(str(raw_file), "PreviewImage") is None
+
+    def test_native_thumbnail_location_cached_per_file_version(self, tmp_path):
+        """Test the IFD walk runs once per file version; later calls just read."""
+        import os
+        from thumbnail_extraction import _locate_ifd1_jpeg, extract_thumbnail_native
+
+        raw_file = tmp_path / "test.arw"
+        raw_file.write_bytes(_tiff_with_thumbnail("<", b"\xff\xd8one"))
+        _locate_ifd1_jpeg.cache_clear()
+
+        assert extract_thumbnail_native(str(raw_file)) == b"\xff\xd8one"
+        assert extract_thumbnail_native(str(raw_file)) == b"\xff\xd8one"
+        assert _locate_ifd1_jpeg.cache_info().misses == 1
+
+        raw_file.write_bytes(_tiff_with_thumbnail("<", b"\xff\xd8second"))
+        st = os.stat(raw_file)
+        os.utime(raw_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert extract_thumbnail_native(str(raw_file)) == b"\xff\xd8second"
+        assert _locate_ifd1_jpeg.cache_info().misses == 2
+
+    def test_extract_thumbnail_native_rejects_other_files(self, tmp_path):
+        """Test non-TIFF and truncated files report no thumbnail instead of raising."""
+        from thumbnail_extraction import extract_thumbnail_native
+
+        cr3 = tmp_path / "test.cr3"
+        cr3.write_bytes(b"\x00\x00\x00\x18ftypcrx ")
+        truncated = tmp_path / "test.cr2"
+        truncated.write_bytes(_tiff_with_thumbnail("<", b"\xff\xd8JPEG")[:-2])
+
+        assert extract_thumbnail_native(str(cr3)) is None
+        assert extract_thumbnail_native(str(truncated)) is None
+        assert extract_thumbnail_native(str(tmp_path / "missing.arw")) is None
+
+    def test_lazy_thumbnails_decode_on_demand(self):
+        """Test lazy extraction reports sizes without decoding and decodes once."""
+        import io
+        import thumbnail_extraction
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 30), color="red").save(buffer, format="JPEG")
+        images = {
+            "ThumbnailImage": buffer.getvalue(),
+            "PreviewImage": None,
+            "JpgFromRaw": b"\xff\xd8never decoded",
+        }
+
+        with patch.object(
+            thumbnail_extraction, "extract_thumbnails_exiftool", return_value=images
+        ):
+            thumbnail, preview, jpg_from_raw = (
+                thumbnail_extraction.extract_all_thumbnails_lazy("test.arw")
+            )
+
+        assert preview is None
+        assert jpg_from_raw.data == b"\xff\xd8never decoded"
+        with patch.object(
+            thumbnail_extraction,
+            "bytes_to_tensor",
+            wraps=thumbnail_extraction.bytes_to_tensor,
+        ) as mock_decode:
+            assert thumbnail.size == (40, 30)
+            mock_decode.assert_not_called()
+            assert thumbnail.tensor.shape == (1, 30, 40, 3)
+            assert thumbnail.tensor is thumbnail.tensor
+            mock_decode.assert_called_once()
+
+    def test_extract_all_thumbnails_async_runs_off_loop(self):
+        """Test the async API waits on ExifTool in an executor, not the loop thread."""
+        import asyncio
+        import threading
+        import thumbnail_extraction
+
+        threads = []
+
+        def extract(raw_paths, thumbnail_types):
+            threads.append(threading.current_thread())
+            return [
+                {"ThumbnailImage": b"A", "PreviewImage": None, "JpgFromRaw": None},
+                {"ThumbnailImage": None, "PreviewImage": None, "JpgFromRaw": b"B"},
+            ]
+
+        with patch.object(
+            thumbnail_extraction,
+            "extract_thumbnails_exiftool_batch",
+            side_effect=extract,
+        ):
+            with patch.object(
+                thumbnail_extraction,
+                "bytes_to_tensor",
+                side_effect=lambda data, device=None: data,
+            ):
+                results = asyncio.run(
+                    thumbnail_extraction.extract_all_thumbnails_async(
+                        ["a.arw", "b.arw"]
+                    )
+                )
+
+        assert results == [(b"A", None, None), (None, None, b"B")]
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_exiftool_worker_none_when_not_installed(self):
+        """Test the worker pool yields None instead of raising without ExifTool."""
+        import thumbnail_extraction
+
+        with patch("subprocess.Popen", side_effect=FileNotFoundError):
+            with thumbnail_extraction._exiftool_worker() as worker:
+                assert worker is None
+        assert thumbnail_extraction._ET_WORKERS == []
+
+    def test_exiftool_process_reads_until_ready(self):
+        """Test the stay_open protocol: command framing and {readyN} parsing."""
+        import os
+        from thumbnail_extraction import ExifToolProcess
+
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"\xff\xd8JPEG{ready1}\r\n")
+        os.close(write_fd)
+
+        mock_proc = MagicMock()
+        mock_proc.stdout.fileno.return_value = read_fd
+        with patch("subprocess.Popen", return_value=mock_proc):
+            exiftool = ExifToolProcess()
+            try:
+                result = exiftool.execute("-b", "-ThumbnailImage", "test.arw")
+            finally:
+                os.close(read_fd)
+
+        assert result == b"\xff\xd8JPEG"
+        sent = mock_proc.stdin.write.call_args.args[0].decode("utf-8")
+        assert sent.endswith("-b\n-ThumbnailImage\ntest.arw\n-execute1\n")
+
+    def test_exiftool_process_killed_on_timeout(self):
+        """Test a hung ExifTool is killed and retired instead of blocking forever."""
+        import os
+        from thumbnail_extraction import ExifToolProcess
+
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"partial output")
+
+        mock_proc = MagicMock()
+        mock_proc.poll.return_value = None
+        mock_proc.stdout.fileno.return_value = read_fd
+        # Killing the real process closes its end of the pipe
+        mock_proc.kill.side_effect = lambda: os.close(write_fd)
+        with patch("subprocess.Popen", return_value=mock_proc):
+            exiftool = ExifToolProcess()
+            try:
+                with pytest.raises(TimeoutError):
+                    exiftool.execute("-b", "-ThumbnailImage", "test.arw", timeout=0.1)
+            finally:
+                os.close(read_fd)
+
+        mock_proc.kill.assert_called()
+        assert not exiftool.alive
+
+    def test_exiftool_worker_gives_up_on_busy_pool(self):
+        """Test a pool of stuck workers yields None so callers run a one-shot call."""
+        import thumbnail_extraction
+
+        with patch.object(thumbnail_extraction, "_ET_WAIT_TIMEOUT", 0.05):
+            with patch.object(thumbnail_extraction, "_start_worker", return_value=None):
+                with thumbnail_extraction._exiftool_worker() as worker:
+                    assert worker is None
+
+    def test_exiftool_launch_stays_on_vfork_path(self):
+        """Test ExifTool is started by absolute path without fork-forcing options."""
+        from thumbnail_extraction import ExifToolProcess
+
+        with patch("shutil.which", return_value="/usr/bin/exiftool"):
+            with patch("subprocess.Popen") as mock_popen:
+                with patch("thumbnail_extraction._grow_pipe"):
+                    ExifToolProcess()
+
+        args, kwargs = mock_popen.call_args
+        assert args[0][0] == "/usr/bin/exiftool"
+        # Any of these makes CPython fork() the whole (multi-GB) ComfyUI process
+        forcing_fork = {"preexec_fn", "user", "group", "extra_groups", "umask"}
+        assert forcing_fork.isdisjoint(kwargs)
+
+    def test_exiftool_process_grows_stdout_pipe(self):
+        """Test the stay_open stdout pipe is enlarged for multi-MB previews."""
+        import os
+        import thumbnail_extraction
+
+        fcntl = pytest.importorskip("fcntl")
+        if not hasattr(fcntl, "F_GETPIPE_SZ"):
+            pytest.skip("pipe size is not adjustable on this platform")
+
+        read_fd, write_fd = os.pipe()
+        mock_proc = MagicMock()
+        mock_proc.stdout.fileno.return_value = read_fd
+        try:
+            with patch("subprocess.Popen", return_value=mock_proc):
+                thumbnail_extraction.ExifToolProcess()
+            size = fcntl.fcntl(read_fd, fcntl.F_GETPIPE_SZ)
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        assert size == thumbnail_extraction._PIPE_SIZE
 
     def test_bytes_to_tensor_shape(self):
         """Test conversion of JPEG bytes to tensor."""
@@ -69,3 +586,222 @@ class TestThumbnailExtraction:
         assert tensor.dtype == torch.float32
         assert tensor.min() >= 0.0
         assert tensor.max() <= 1.0
+
+    def test_bytes_to_tensor_decodes_on_gpu(self):
+        """Test CUDA targets go through torchvision's decode_jpeg, not Pillow."""
+        import thumbnail_extraction
+
+        chw = torch.full((3, 4, 6), 255, dtype=torch.uint8)
+        mock_decode = MagicMock(return_value=chw)
+        with patch.object(thumbnail_extraction, "decode_jpeg", mock_decode):
+            with patch.object(
+                thumbnail_extraction, "ImageReadMode", MagicMock(), create=True
+            ):
+                with patch("torch.cuda.is_available", return_value=True):
+                    with patch.object(
+                        thumbnail_extraction.Image,
+                        "open",
+                        side_effect=AssertionError("Pillow used"),
+                    ):
+                        tensor = thumbnail_extraction.bytes_to_tensor(
+                            b"\xff\xd8JPEG", device="cuda"
+                        )
+
+        assert mock_decode.call_args.kwargs["device"] == "cuda"
+        assert tensor.shape == (1, 4, 6, 3)
+        assert tensor.dtype == torch.float32
+        assert tensor.is_contiguous()
+        assert torch.all(tensor == 1.0)
+
+    def test_bytes_to_tensor_moves_uint8_to_device(self):
+        """Test an explicit device receives uint8 pixels and normalizes there."""
+        import thumbnail_extraction
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), color="white").save(buffer, format="PNG")
+
+        with patch.object(
+            thumbnail_extraction.torch, "from_numpy", wraps=torch.from_numpy
+        ) as mock_from_numpy:
+            tensor = thumbnail_extraction.bytes_to_tensor(
+                buffer.getvalue(), device="cpu"
+            )
+
+        assert mock_from_numpy.call_args.args[0].dtype == np.uint8
+        assert tensor.shape == (1, 8, 8, 3)
+        assert tensor.dtype == torch.float32
+        assert torch.all(tensor == 1.0)
+
+    @pytest.mark.parametrize("channels_last", [True, False])
+    def test_bytes_to_tensor_device_normalize_matches_cpu(self, channels_last):
+        """Test the on-device normalize gives the host result, laid out contiguously."""
+        from thumbnail_extraction import bytes_to_tensor
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (5, 3), color=(255, 7, 51)).save(buffer, format="PNG")
+
+        on_device = bytes_to_tensor(
+            buffer.getvalue(), device="cpu", channels_last=channels_last
+        )
+
+        assert on_device.is_contiguous()
+        assert torch.equal(
+            on_device, bytes_to_tensor(buffer.getvalue(), channels_last=channels_last)
+        )
+
+    def test_bytes_to_tensor_draft_downscale(self):
+        """Test min_size decodes a large JPEG at a reduced scale."""
+        from thumbnail_extraction import bytes_to_tensor
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (800, 600), color="red").save(buffer, format="JPEG")
+
+        tensor = bytes_to_tensor(buffer.getvalue(), min_size=160)
+
+        # libjpeg picks the smallest 1/2^n scale that keeps both sides >= 160
+        assert tensor.shape == (1, 300, 400, 3)
+        assert tensor[0, 0, 0, 0] > 0.9
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="needs CUDA")
+    def test_bytes_to_tensor_pinned_upload(self):
+        """Test the Pillow path uploads to CUDA and results never share storage."""
+        import thumbnail_extraction
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 4), color="white").save(buffer, format="PNG")
+
+        with patch.object(thumbnail_extraction, "decode_jpeg", None):
+            first = thumbnail_extraction.bytes_to_tensor(buffer.getvalue(), "cuda")
+            second = thumbnail_extraction.bytes_to_tensor(buffer.getvalue(), "cuda")
+
+        assert first.is_cuda
+        assert torch.all(first == 1.0)
+        assert first.data_ptr() != second.data_ptr()
+
+    def test_bytes_to_tensor_planar(self):
+        """Test channels_last=False gives a contiguous [B, C, H, W] tensor."""
+        from thumbnail_extraction import bytes_to_tensor
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (5, 3), color=(255, 0, 51)).save(buffer, format="PNG")
+
+        planar = bytes_to_tensor(buffer.getvalue(), channels_last=False)
+
+        assert planar.shape == (1, 3, 3, 5)
+        assert planar.is_contiguous()
+        assert torch.equal(
+            planar, bytes_to_tensor(buffer.getvalue()).permute(0, 3, 1, 2)
+        )
+
+    def test_bytes_to_tensor_prefers_simplejpeg(self):
+        """Test simplejpeg's array is used directly, passing min_size through."""
+        import thumbnail_extraction
+
+        decoder = MagicMock()
+        decoder.decode_jpeg.return_value = np.full((4, 6, 3), 255, dtype=np.uint8)
+        with patch.object(thumbnail_extraction, "_simplejpeg", decoder):
+            with patch.object(
+                thumbnail_extraction.Image,
+                "open",
+                side_effect=AssertionError("Pillow used"),
+            ):
+                tensor = thumbnail_extraction.bytes_to_tensor(b"jpeg", min_size=4)
+
+        decoder.decode_jpeg.assert_called_once_with(
+            b"jpeg", colorspace="RGB", min_width=4, min_height=4
+        )
+        assert tensor.shape == (1, 4, 6, 3)
+        assert torch.all(tensor == 1.0)
+
+    def test_bytes_to_tensor_uses_torchvision_on_cpu(self):
+        """Test torchvision's decode feeds the normalize without a Pillow image."""
+        import thumbnail_extraction
+
+        # What decode_jpeg returns: a CHW view of an HWC buffer
+        hwc = torch.full((4, 6, 3), 255, dtype=torch.uint8)
+        mock_decode = MagicMock(return_value=hwc.permute(2, 0, 1))
+        with patch.multiple(
+            thumbnail_extraction,
+            _simplejpeg=None,
+            _turbo_jpeg=None,
+            decode_jpeg=mock_decode,
+            ImageReadMode=MagicMock(),
+            create=True,
+        ):
+            with patch.object(
+                thumbnail_extraction.Image,
+                "open",
+                side_effect=AssertionError("Pillow used"),
+            ):
+                tensor = thumbnail_extraction.bytes_to_tensor(b"jpeg")
+
+        assert "device" not in mock_decode.call_args.kwargs
+        assert tensor.shape == (1, 4, 6, 3)
+        assert tensor.is_contiguous()
+        assert torch.all(tensor == 1.0)
+
+    def test_bytes_to_tensor_falls_back_to_pillow(self):
+        """Test input the libjpeg-turbo decoders reject still decodes via Pillow."""
+        import thumbnail_extraction
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (3, 2), color="white").save(buffer, format="PNG")
+        decoder = MagicMock()
+        decoder.decode_jpeg.side_effect = ValueError("not a JPEG")
+        turbo = MagicMock()
+        turbo.decode.side_effect = OSError("not a JPEG")
+
+        with patch.multiple(
+            thumbnail_extraction,
+            _simplejpeg=decoder,
+            _turbo_jpeg=turbo,
+            TJPF_RGB=0,
+            decode_jpeg=MagicMock(side_effect=RuntimeError("not a JPEG")),
+            ImageReadMode=MagicMock(),
+            create=True,
+        ):
+            tensor = thumbnail_extraction.bytes_to_tensor(buffer.getvalue())
+
+        turbo.decode.assert_called_once()
+        assert tensor.shape == (1, 2, 3, 3)
+        assert torch.all(tensor == 1.0)
+
+    def test_bytes_to_tensor_converts_grayscale(self):
+        """Test non-RGB JPEGs are still expanded to 3 channels."""
+        from thumbnail_extraction import bytes_to_tensor
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("L", (10, 6), color=128).save(buffer, format="JPEG")
+
+        tensor = bytes_to_tensor(buffer.getvalue())
+
+        assert tensor.shape == (1, 6, 10, 3)
+
+    def test_bytes_to_tensor_white_is_exactly_one(self):
+        """Test 255 maps to exactly 1.0 in a writable float32 tensor."""
+        from thumbnail_extraction import bytes_to_tensor
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), color="white").save(buffer, format="PNG")
+
+        tensor = bytes_to_tensor(buffer.getvalue())
+
+        assert tensor.dtype == torch.float32
+        assert torch.all(tensor == 1.0)
+        tensor.mul_(0.5)  # Not backed by PIL's read-only buffer
@@ -7,28 +7,267 @@ using ExifTool, which can target individual tags like ThumbnailImage vs PreviewI
 This is isolated from ComfyUI dependencies to allow for clean unit testing.
 """
 
+import asyncio
+import atexit
+import base64
+import functools
+import itertools
+import json
+import os
+import queue
+import shutil
+import struct
 import subprocess
 import io
-from typing import Optional, Literal, Tuple
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Literal, Sequence, Tuple
 import numpy as np
 import torch
 from PIL import Image
 
+try:
+    import fcntl
+except ImportError:
+    # Windows: pipes keep their default size
+    fcntl = None
 
+try:
+    import simplejpeg as _simplejpeg
+except ImportError:
+    # Optional: libjpeg-turbo bindings that ship their own library
+    _simplejpeg = None
+
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # Optional: PyTurboJPEG is missing, or it can't find libturbojpeg
+    _turbo_jpeg = None
+
+try:
+    from torchvision.io import ImageReadMode, decode_jpeg
+except ImportError:
+    # Without torchvision, JPEGs are always decoded on the CPU by Pillow
+    decode_jpeg = None
+
+ThumbnailType = Literal["ThumbnailImage", "PreviewImage", "JpgFromRaw"]
+THUMBNAIL_TYPES: Tuple[ThumbnailType, ...] = (
+    "ThumbnailImage",
+    "PreviewImage",
+    "JpgFromRaw",
+)
+
+# TIFF byte-order marks (ARW, CR2, NEF, DNG, ...) and the struct prefix for each
+_TIFF_BYTE_ORDER = {b"II*\x00": "<", b"MM\x00*": ">"}
+_TAG_JPEG_OFFSET = 0x0201  # JPEGInterchangeFormat
+_TAG_JPEG_LENGTH = 0x0202  # JPEGInterchangeFormatLength
+_TIFF_SHORT = 3
+_MAX_IFD_ENTRIES = 1024  # Anything larger is not a real IFD
+
+# uint8 -> [0, 1] scale, as a float32 scalar so results never promote to float64
+_INV_255 = np.float32(1.0 / 255.0)
+
+# Pillow releases the GIL while decoding, so the images of one file decode in parallel
+_DECODE_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="exiftool-decode")
+
+
+@functools.lru_cache(maxsize=1)
+def _exiftool_executable() -> str:
+    """Absolute path to exiftool, resolved once instead of on every exec."""
+    return shutil.which("exiftool") or "exiftool"
+
+
+@functools.lru_cache(maxsize=1)
 def is_exiftool_available() -> bool:
-    """Check if exiftool is installed and accessible."""
+    """Check if exiftool is installed and accessible (probed once per process)."""
     try:
-        result = subprocess.run(["exiftool", "-ver"], capture_output=True, timeout=5)
+        result = subprocess.run(
+            [_exiftool_executable(), "-ver"], capture_output=True, timeout=5
+        )
         return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
 
 
+# Multi-MB JpgFromRaw payloads come through in 1 MiB reads instead of 64 KiB
+# ones where the pipe can be grown (Linux; 1 MiB is the default unprivileged cap)
+_PIPE_SIZE = 1 << 20
+
+
+def _grow_pipe(pipe) -> None:
+    """Enlarge a pipe's kernel buffer, where the platform allows it."""
+    set_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if set_size is None:
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), set_size, _PIPE_SIZE)
+    except OSError:
+        pass  # Above /proc/sys/fs/pipe-max-size; keep the default
+
+
+class ExifToolProcess:
+    """
+    A long-running ``exiftool -stay_open`` process.
+
+    Starting ExifTool means starting a Perl interpreter, which costs far more than
+    the extraction itself. This keeps one process alive and feeds it commands
+    over stdin, reading each response up to its ``{readyN}`` marker.
+    """
+
+    def __init__(self, executable: Optional[str] = None):
+        self._proc = subprocess.Popen(
+            [executable or _exiftool_executable(), "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        _grow_pipe(self._proc.stdout)
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._broken = False
+
+    @property
+    def alive(self) -> bool:
+        return not self._broken and self._proc.poll() is None
+
+    def _kill(self) -> None:
+        if not self._broken:
+            self._broken = True
+            self._proc.kill()
+
+    def execute(self, *args: str, timeout: float = 10.0) -> bytes:
+        """
+        Run one ExifTool command and return its raw stdout.
+
+        Raises:
+            TimeoutError: ExifTool did not answer within timeout seconds
+            OSError: The process died or the pipe broke
+
+        On any error the process is killed rather than reused: its unread
+        output would otherwise be taken as part of the next response.
+        """
+        with self._lock:
+            seq = next(self._counter)
+            command = "\n".join(("-charset", "filename=utf8") + args)
+            # Killing a hung ExifTool closes its stdout, which ends the blocking
+            # read with EOF. A timer rather than select(): Windows can't select
+            # on pipes.
+            watchdog = threading.Timer(timeout, self._kill)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                self._proc.stdin.write(f"{command}\n-execute{seq}\n".encode("utf-8"))
+                self._proc.stdin.flush()
+                return self._read_response(f"{{ready{seq}}}".encode("ascii"))
+            except BaseException:
+                timed_out = self._broken
+                self._kill()
+                if timed_out:
+                    raise TimeoutError(
+                        f"exiftool did not answer within {timeout}s"
+                    ) from None
+                raise
+            finally:
+                watchdog.cancel()
+
+    def _read_response(self, marker: bytes) -> bytes:
+        fd = self._proc.stdout.fileno()
+        buffer = bytearray()
+        while True:
+            chunk = os.read(fd, _PIPE_SIZE)
+            if not chunk:
+                raise OSError("exiftool exited unexpectedly")
+            buffer += chunk
+            # The marker is followed by a newline (CRLF on Windows)
+            if buffer[-len(marker) - 2 :].rstrip(b"\r\n").endswith(marker):
+                return bytes(buffer.rstrip(b"\r\n")[: -len(marker)])
+
+    def close(self) -> None:
+        """Ask ExifTool to exit, killing it if it does not."""
+        if not self.alive:
+            return
+        try:
+            self._proc.stdin.write(b"-stay_open\nFalse\n")
+            self._proc.stdin.flush()
+            self._proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+
+
+# Concurrent extractions each borrow their own process; more are only started
+# while every existing one is busy.
+_ET_POOL_SIZE = min(4, os.cpu_count() or 1)
+_ET_IDLE: "queue.LifoQueue[ExifToolProcess]" = queue.LifoQueue()
+_ET_WORKERS: List[ExifToolProcess] = []
+_ET_LOCK = threading.Lock()
+# Seconds to wait for a busy pool before falling back to a one-shot process
+_ET_WAIT_TIMEOUT = 10.0
+
+
+def _start_worker() -> Optional[ExifToolProcess]:
+    """Start another ExifTool process, or return None if the pool is full."""
+    with _ET_LOCK:
+        if len(_ET_WORKERS) >= _ET_POOL_SIZE:
+            return None
+        worker = ExifToolProcess()
+        _ET_WORKERS.append(worker)
+        return worker
+
+
+@contextmanager
+def _exiftool_worker() -> Iterator[Optional[ExifToolProcess]]:
+    """Borrow an idle ExifTool process from the pool, or None if it cannot start."""
+    try:
+        worker = _ET_IDLE.get_nowait()
+    except queue.Empty:
+        worker = None
+
+    deadline = time.monotonic() + _ET_WAIT_TIMEOUT
+    while worker is None:
+        try:
+            worker = _start_worker()
+        except OSError:
+            break  # ExifTool is not installed
+        if worker is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break  # Every worker is stuck; the caller runs its own process
+            # Pool is full: wait for a worker, re-checking in case one died
+            try:
+                worker = _ET_IDLE.get(timeout=min(1.0, remaining))
+            except queue.Empty:
+                pass
+
+    if worker is None:
+        yield None
+        return
+
+    try:
+        yield worker
+    finally:
+        if worker.alive:
+            _ET_IDLE.put(worker)
+        else:
+            with _ET_LOCK:
+                _ET_WORKERS.remove(worker)
+
+
+@atexit.register
+def _shutdown_exiftool() -> None:
+    with _ET_LOCK:
+        for worker in _ET_WORKERS:
+            worker.close()
+        _ET_WORKERS.clear()
+
+
 def extract_thumbnail_exiftool(
     raw_path: str,
-    thumbnail_type: Literal[
-        "ThumbnailImage", "PreviewImage", "JpgFromRaw"
-    ] = "ThumbnailImage",
+    thumbnail_type: ThumbnailType = "ThumbnailImage",
 ) -> Optional[bytes]:
     """
     Extract specific embedded thumbnail using ExifTool.
@@ -43,9 +282,21 @@ def extract_thumbnail_exiftool(
     Returns:
         Binary JPEG data or None if extraction fails
     """
+    with _exiftool_worker() as exiftool:
+        if exiftool is not None:
+            try:
+                return (
+                    exiftool.execute("-fast", "-b", f"-{thumbnail_type}", raw_path)
+                    or None
+                )
+            except TimeoutError:
+                return None  # A one-shot call would hang on this file too
+            except OSError:
+                pass  # Process died mid-command, fall back to a one-shot call
+
     try:
         result = subprocess.run(
-            ["exiftool", "-b", f"-{thumbnail_type}", raw_path],
+            [_exiftool_executable(), "-fast", "-b", f"-{thumbnail_type}", raw_path],
             capture_output=True,
             check=True,
             timeout=10,
@@ -59,46 +310,513 @@ def extract_thumbnail_exiftool(
         return None
 
 
-def bytes_to_tensor(jpeg_bytes: bytes) -> torch.Tensor:
+def _read_ifd(f, endian: str, offset: int) -> Tuple[Dict[int, int], int]:
+    """Read the single-value tags of the IFD at offset, and the next IFD's offset."""
+    f.seek(offset)
+    (count,) = struct.unpack(endian + "H", f.read(2))
+    if count > _MAX_IFD_ENTRIES:
+        raise ValueError(f"implausible IFD entry count {count}")
+    table = f.read(count * 12 + 4)
+
+    tags: Dict[int, int] = {}
+    for i in range(count):
+        tag, field_type, n, value = struct.unpack_from(endian + "HHI4s", table, i * 12)
+        if n == 1:
+            code = "H" if field_type == _TIFF_SHORT else "I"
+            tags[tag] = struct.unpack_from(endian + code, value)[0]
+    (next_offset,) = struct.unpack_from(endian + "I", table, count * 12)
+    return tags, next_offset
+
+
+@functools.lru_cache(maxsize=256)
+def _locate_ifd1_jpeg(
+    raw_path: str, mtime_ns: int, size: int
+) -> Optional[Tuple[int, int]]:
+    """(offset, length) of the IFD1 JPEG, memoized per file version."""
+    try:
+        with open(raw_path, "rb") as f:
+            header = f.read(8)
+            endian = _TIFF_BYTE_ORDER.get(header[:4])
+            if endian is None:
+                return None
+            (ifd0_offset,) = struct.unpack(endian + "I", header[4:])
+            _, ifd1_offset = _read_ifd(f, endian, ifd0_offset)
+            if not ifd1_offset:
+                return None
+            ifd1, _ = _read_ifd(f, endian, ifd1_offset)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    start = ifd1.get(_TAG_JPEG_OFFSET)
+    length = ifd1.get(_TAG_JPEG_LENGTH)
+    if not start or not length:
+        return None
+    return start, length
+
+
+def extract_thumbnail_native(
+    raw_path: str,
+    thumbnail_type: ThumbnailType = "ThumbnailImage",
+) -> Optional[bytes]:
+    """
+    Slice the embedded thumbnail out of a TIFF-based RAW file without ExifTool.
+
+    Only ThumbnailImage has a fixed home across makers: the JPEG referenced by
+    IFD1. PreviewImage and JpgFromRaw sit in maker-specific places, so those
+    (and non-TIFF containers such as CR3) are left to ExifTool.
+
+    Args:
+        raw_path: Path to RAW file
+        thumbnail_type: Which embedded image to extract
+
+    Returns:
+        Binary JPEG data, or None if the file does not have one where expected
+    """
+    if thumbnail_type != "ThumbnailImage":
+        return None
+
+    try:
+        st = os.stat(raw_path)
+        location = _locate_ifd1_jpeg(raw_path, st.st_mtime_ns, st.st_size)
+        if location is None:
+            return None
+        start, length = location
+        with open(raw_path, "rb") as f:
+            f.seek(start)
+            data = f.read(length)
+    except OSError:
+        return None
+
+    # A truncated file or a non-JPEG IFD1 is not worth handing to the decoder
+    if len(data) != length or not data.startswith(b"\xff\xd8"):
+        return None
+    return data
+
+
+def _decode_json_images(
+    output: bytes,
+    raw_paths: Sequence[str],
+    thumbnail_types: Sequence[ThumbnailType],
+) -> List[Dict[ThumbnailType, Optional[bytes]]]:
+    """Pick each file's base64-encoded images out of ExifTool's ``-j -b`` output."""
+    try:
+        records = json.loads(output)
+    except ValueError:
+        records = []
+
+    # Unreadable files get no record at all, so match on SourceFile rather
+    # than position
+    by_path = {
+        os.path.normpath(record.get("SourceFile", "")): record
+        for record in records
+        if isinstance(record, dict)
+    }
+
+    results = []
+    for raw_path in raw_paths:
+        record = by_path.get(os.path.normpath(raw_path), {})
+        images: Dict[ThumbnailType, Optional[bytes]] = {}
+        for thumbnail_type in thumbnail_types:
+            value = record.get(thumbnail_type)
+            if isinstance(value, str) and value.startswith("base64:"):
+                images[thumbnail_type] = base64.b64decode(value[7:]) or None
+            else:
+                images[thumbnail_type] = None
+        results.append(images)
+    return results
+
+
+def extract_thumbnails_exiftool_batch(
+    raw_paths: Sequence[str],
+    thumbnail_types: Sequence[ThumbnailType] = THUMBNAIL_TYPES,
+) -> List[Dict[ThumbnailType, Optional[bytes]]]:
+    """
+    Extract several embedded images from several files with one ExifTool command.
+
+    Args:
+        raw_paths: Paths to RAW files
+        thumbnail_types: Which embedded images to extract
+
+    Returns:
+        One mapping per path, in order, of each requested type to its binary
+        JPEG data, or None if that image is missing or extraction fails
+    """
+    if not raw_paths:
+        return []
+
+    # -b alone would concatenate the images; with -j each one comes back as
+    # its own base64 string in one JSON record per file. -fast skips the scan
+    # for trailers past the image data; -fast2 is avoided because it also
+    # skips MakerNotes, where e.g. Nikon keeps its PreviewImage.
+    args = ["-fast", "-j", "-b"] + [f"-{t}" for t in thumbnail_types] + list(raw_paths)
+
+    with _exiftool_worker() as exiftool:
+        if exiftool is not None:
+            try:
+                output = exiftool.execute(*args, timeout=10 * len(raw_paths))
+                return _decode_json_images(output, raw_paths, thumbnail_types)
+            except TimeoutError:
+                # A one-shot call would hang on the same file too
+                return _decode_json_images(b"", raw_paths, thumbnail_types)
+            except OSError:
+                pass  # Process died mid-command, fall back to a one-shot call
+
+    try:
+        result = subprocess.run(
+            [_exiftool_executable()] + args,
+            capture_output=True,
+            check=True,
+            timeout=10 * len(raw_paths),
+        )
+        output = result.stdout
+    except (
+        subprocess.CalledProcessError,
+        FileNotFoundError,
+        subprocess.TimeoutExpired,
+    ):
+        output = b""
+    return _decode_json_images(output, raw_paths, thumbnail_types)
+
+
+def extract_thumbnails_exiftool(
+    raw_path: str,
+    thumbnail_types: Sequence[ThumbnailType] = THUMBNAIL_TYPES,
+) -> Dict[ThumbnailType, Optional[bytes]]:
+    """
+    Extract several embedded images with a single ExifTool command.
+
+    Args:
+        raw_path: Path to RAW file
+        thumbnail_types: Which embedded images to extract
+
+    Returns:
+        Mapping of each requested type to its binary JPEG data, or None if
+        that image is missing or extraction fails
+    """
+    return extract_thumbnails_exiftool_batch([raw_path], thumbnail_types)[0]
+
+
+def _decode_rgb(jpeg_bytes: bytes, min_size: Optional[int] = None) -> np.ndarray:
+    """Decode image bytes to an (H, W, 3) uint8 RGB array, fastest decoder first."""
+    if _simplejpeg is not None:
+        try:
+            # libjpeg-turbo straight into a numpy array, scaled IDCT included
+            return _simplejpeg.decode_jpeg(
+                jpeg_bytes,
+                colorspace="RGB",
+                min_width=min_size or 0,
+                min_height=min_size or 0,
+            )
+        except ValueError:
+            pass  # Not a JPEG, or one libjpeg-turbo rejects
+    if _turbo_jpeg is not None and min_size is None:
+        try:
+            return _turbo_jpeg.decode(jpeg_bytes, pixel_format=TJPF_RGB)
+        except OSError:
+            pass
+    if decode_jpeg is not None and min_size is None:
+        try:
+            # Decodes into a torch buffer, skipping the copy Pillow makes when
+            # handing pixels to numpy. The CHW result is a view of HWC memory,
+            # so permuting back is free.
+            data = torch.frombuffer(bytearray(jpeg_bytes), dtype=torch.uint8)
+            image = decode_jpeg(data, mode=ImageReadMode.RGB)
+            return image.permute(1, 2, 0).numpy()
+        except RuntimeError:
+            pass
+
+    pil_image = Image.open(io.BytesIO(jpeg_bytes))
+    if min_size is not None:
+        # Scaled IDCT: a fraction of the decode work instead of a resize after
+        pil_image.draft("RGB", (min_size, min_size))
+    if pil_image.mode != "RGB":
+        pil_image = pil_image.convert("RGB")
+    return np.asarray(pil_image)
+
+
+def _normalize_u8(image: torch.Tensor) -> torch.Tensor:
+    """
+    Scale uint8 pixels to a contiguous float32 tensor in [0, 1] in one pass.
+
+    Casting and then scaling in place reads and writes the float32 result
+    twice; writing the product straight into a contiguous buffer is a single
+    kernel that also lays out a permuted view.
+    """
+    out = torch.empty(image.shape, dtype=torch.float32, device=image.device)
+    return torch.mul(image, _INV_255, out=out)
+
+
+def bytes_to_tensor(
+    jpeg_bytes: bytes,
+    device: Optional[torch.device] = None,
+    min_size: Optional[int] = None,
+    channels_last: bool = True,
+) -> torch.Tensor:
     """
     Convert JPEG bytes to ComfyUI-compatible tensor [B, H, W, C].
 
     Args:
         jpeg_bytes: Raw JPEG binary data
+        device: Where the tensor should live. CUDA devices decode with nvJPEG
+            when torchvision is available; the default is the CPU.
+        min_size: If set, let libjpeg scale by 1/2, 1/4 or 1/8 while decoding,
+            as far as both sides stay at least this large.
+        channels_last: False returns a planar [B, C, H, W] tensor, transposed
+            during the normalize instead of in a later permute().contiguous()
 
     Returns:
         float32 tensor normalized to [0, 1]
     """
-    pil_image = Image.open(io.BytesIO(jpeg_bytes))
-    pil_image = pil_image.convert("RGB")
-    array = np.array(pil_image).astype(np.float32) / 255.0
+    if min_size is None and device is not None and torch.device(device).type == "cuda":
+        if decode_jpeg is not None and torch.cuda.is_available():
+            # bytearray: torch.frombuffer wants a writable buffer
+            data = torch.frombuffer(bytearray(jpeg_bytes), dtype=torch.uint8)
+            image = decode_jpeg(data, mode=ImageReadMode.RGB, device=device)
+            if channels_last:
+                image = image.permute(1, 2, 0)
+            return _normalize_u8(image).unsqueeze(0)
+
+    pixels = _decode_rgb(jpeg_bytes, min_size)
+
+    if device is not None:
+        # Ship the uint8 pixels and normalize on the device: a quarter of the
+        # transfer of moving the float32 result
+        if torch.device(device).type == "cuda" and torch.cuda.is_available():
+            # Stage in pinned memory (from torch's caching host allocator, so
+            # not a fresh allocation per call) for a DMA copy that doesn't
+            # bounce through an internal pinned buffer. Nothing is reused
+            # across calls: returned tensors never alias each other.
+            staging = torch.empty(pixels.shape, dtype=torch.uint8, pin_memory=True)
+            staging.numpy()[...] = pixels
+            uploaded = staging.to(device, non_blocking=True)
+        else:
+            # Pillow's arrays are read-only views; the decoders' are not
+            pixels = np.require(pixels, requirements="W")
+            uploaded = torch.from_numpy(pixels).to(device)
+        if not channels_last:
+            uploaded = uploaded.permute(2, 0, 1)
+        return _normalize_u8(uploaded).unsqueeze(0)
+
+    if not channels_last:
+        pixels = pixels.transpose(2, 0, 1)  # A strided view, no copy
+    # One fused pass over a no-copy view instead of copy, cast, divide;
+    # order="C" lays a planar result out contiguously
+    array = np.multiply(pixels, _INV_255, dtype=np.float32, order="C")
     return torch.from_numpy(array).unsqueeze(0)
 
 
+class LazyThumbnail:
+    """
+    An extracted embedded JPEG that is only decoded when its pixels are needed.
+
+    Callers that just pick the largest image, or only want the JPEG bytes,
+    skip the decodes of the images they pass over.
+    """
+
+    __slots__ = ("data", "_size", "_tensor")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._size: Optional[Tuple[int, int]] = None
+        self._tensor: Optional[torch.Tensor] = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height), read from the JPEG header without decoding."""
+        if self._size is None:
+            self._size = Image.open(io.BytesIO(self.data)).size
+        return self._size
+
+    @property
+    def tensor(self) -> torch.Tensor:
+        """The decoded [B, H, W, C] float32 tensor, decoded on first access."""
+        if self._tensor is None:
+            self._tensor = bytes_to_tensor(self.data)
+        return self._tensor
+
+
+def _submit_decodes(
+    per_file: Sequence[Dict[ThumbnailType, Optional[bytes]]],
+    device: Optional[torch.device],
+) -> List[List[Optional["Future[torch.Tensor]"]]]:
+    """Queue every extracted image for decoding; None where there was none."""
+    return [
+        [
+            _DECODE_POOL.submit(bytes_to_tensor, images[t], device)
+            if images[t]
+            else None
+            for t in THUMBNAIL_TYPES
+        ]
+        for images in per_file
+    ]
+
+
+def extract_all_thumbnails_batch(
+    raw_paths: Sequence[str],
+    device: Optional[torch.device] = None,
+) -> List[
+    Tuple[Optional[torch.Tensor], Optional[torch.Tensor], Optional[torch.Tensor]]
+]:
+    """
+    Extract all three embedded images from each of several RAW files.
+
+    Args:
+        raw_paths: Paths to RAW files
+        device: Where to decode the images (see bytes_to_tensor)
+
+    Returns:
+        One (thumbnail, preview, jpg_from_raw) tuple of tensors per path.
+        Any may be None if extraction fails.
+    """
+    per_file = extract_thumbnails_exiftool_batch(raw_paths, THUMBNAIL_TYPES)
+    return [
+        tuple(future.result() if future is not None else None for future in row)
+        for row in _submit_decodes(per_file, device)
+    ]
+
+
+def extract_thumbnails_stacked(
+    raw_paths: Sequence[str],
+    thumbnail_type: ThumbnailType = "ThumbnailImage",
+    device: Optional[torch.device] = None,
+) -> Tuple[torch.Tensor, List[Tuple[int, int]]]:
+    """
+    Extract one embedded image from each of several RAW files into one tensor.
+
+    The images come from a single ExifTool command and are decoded in
+    parallel, then normalized straight into one preallocated batch instead
+    of a tensor per file followed by a torch.stack copy.
+
+    Args:
+        raw_paths: Paths to RAW files
+        thumbnail_type: Which embedded image to extract
+        device: Where the batch should live; the default is the CPU
+
+    Returns:
+        Tuple of (images, sizes). images is a float32 [N, H, W, C] tensor
+        sized to the largest image, with smaller ones zero-padded at the
+        bottom and right. sizes holds each image's (height, width), or
+        (0, 0) where extraction failed.
+    """
+    per_file = extract_thumbnails_exiftool_batch(raw_paths, (thumbnail_type,))
+    decodes = [
+        _DECODE_POOL.submit(_decode_rgb, images[thumbnail_type])
+        if images[thumbnail_type]
+        else None
+        for images in per_file
+    ]
+    frames = [future.result() if future is not None else None for future in decodes]
+    sizes = [frame.shape[:2] if frame is not None else (0, 0) for frame in frames]
+
+    height = max((h for h, _ in sizes), default=0)
+    width = max((w for _, w in sizes), default=0)
+    out = torch.zeros(
+        (len(frames), height, width, 3), dtype=torch.float32, device=device
+    )
+    for i, frame in enumerate(frames):
+        if frame is None:
+            continue
+        h, w = frame.shape[:2]
+        if out.device.type == "cpu":
+            np.multiply(frame, _INV_255, out=out[i, :h, :w].numpy())
+        else:
+            src = torch.from_numpy(np.require(frame, requirements="W"))
+            torch.mul(src.to(out.device), _INV_255, out=out[i, :h, :w])
+    return out, sizes
+
+
+async def extract_all_thumbnails_async(
+    raw_paths: Sequence[str],
+    device: Optional[torch.device] = None,
+) -> List[
+    Tuple[Optional[torch.Tensor], Optional[torch.Tensor], Optional[torch.Tensor]]
+]:
+    """
+    Awaitable extract_all_thumbnails_batch that keeps the event loop free.
+
+    The single ExifTool command waits in the loop's default executor and the
+    decodes run on the decode pool, so many callers can be in flight at once
+    without a process or thread per file.
+
+    Args:
+        raw_paths: Paths to RAW files
+        device: Where to decode the images (see bytes_to_tensor)
+
+    Returns:
+        One (thumbnail, preview, jpg_from_raw) tuple of tensors per path.
+        Any may be None if extraction fails.
+    """
+    loop = asyncio.get_running_loop()
+    per_file = await loop.run_in_executor(
+        None, extract_thumbnails_exiftool_batch, list(raw_paths), THUMBNAIL_TYPES
+    )
+    results = []
+    for row in _submit_decodes(per_file, device):
+        tensors = []
+        for future in row:
+            tensors.append(
+                await asyncio.wrap_future(future) if future is not None else None
+            )
+        results.append(tuple(tensors))
+    return results
+
+
 def extract_all_thumbnails(
     raw_path: str,
+    device: Optional[torch.device] = None,
 ) -> Tuple[Optional[torch.Tensor], Optional[torch.Tensor], Optional[torch.Tensor]]:
     """
     Extract all three embedded images from a RAW file.
 
+    Args:
+        raw_path: Path to RAW file
+        device: Where to decode the images (see bytes_to_tensor)
+
     Returns:
         Tuple of (thumbnail, preview, jpg_from_raw) tensors.
-        Any may be None if extraction fails.
+        Any may be None if extraction fails. Repeat calls for an unchanged
+        file return the same tensors, so don't modify them in place.
+    """
+    try:
+        st = os.stat(raw_path)
+    except OSError:
+        return extract_all_thumbnails_batch([raw_path], device)[0]
+    try:
+        return _thumbnails_cached(raw_path, st.st_mtime_ns, st.st_size, device)
+    except LookupError:
+        # Not memoized, so a failed or timed-out ExifTool call is retried
+        return None, None, None
+
+
+# JpgFromRaw is often full resolution (~300 MB as float32), so keep only a few
+@functools.lru_cache(maxsize=8)
+def _thumbnails_cached(
+    raw_path: str, mtime_ns: int, size: int, device: Optional[torch.device]
+) -> Tuple[Optional[torch.Tensor], Optional[torch.Tensor], Optional[torch.Tensor]]:
     """
-    thumbnail = None
-    preview = None
-    jpg_from_raw = None
+    Memoized extract_all_thumbnails, keyed on the file version and device.
 
-    thumb_bytes = extract_thumbnail_exiftool(raw_path, "ThumbnailImage")
-    if thumb_bytes:
-        thumbnail = bytes_to_tensor(thumb_bytes)
+    Raises:
+        LookupError: No embedded image could be extracted
+    """
+    thumbnails = extract_all_thumbnails_batch([raw_path], device)[0]
+    if all(t is None for t in thumbnails):
+        raise LookupError(f"No embedded images extracted from {raw_path}")
+    return thumbnails
 
-    preview_bytes = extract_thumbnail_exiftool(raw_path, "PreviewImage")
-    if preview_bytes:
-        preview = bytes_to_tensor(preview_bytes)
 
-    jpg_bytes = extract_thumbnail_exiftool(raw_path, "JpgFromRaw")
-    if jpg_bytes:
-        jpg_from_raw = bytes_to_tensor(jpg_bytes)
+def extract_all_thumbnails_lazy(
+    raw_path: str,
+) -> Tuple[Optional[LazyThumbnail], Optional[LazyThumbnail], Optional[LazyThumbnail]]:
+    """
+    Extract all three embedded images from a RAW file, deferring their decode.
 
+    Returns:
+        Tuple of (thumbnail, preview, jpg_from_raw) LazyThumbnails.
+        Any may be None if extraction fails.
+    """
+    images = extract_thumbnails_exiftool(raw_path, THUMBNAIL_TYPES)
+    thumbnail, preview, jpg_from_raw = (
+        LazyThumbnail(images[t]) if images[t] else None for t in THUMBNAIL_TYPES
+    )
     return thumbnail, preview, jpg_from_raw